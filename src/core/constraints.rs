@@ -59,6 +59,39 @@ pub fn detect_cycles(
     Ok(())
 }
 
+/// Order constraints so each one runs after every constraint that sets one of its sources
+///
+/// Applying constraints in this order lets chained constraints (A depends on B,
+/// B depends on C) be satisfied in a single pass. Returns constraint indices;
+/// any constraints left in a cycle keep their original relative order.
+pub fn topological_order(constraints: &[ParameterConstraint], params: &[Parameter]) -> Vec<usize> {
+    let targets: Vec<Option<usize>> = constraints
+        .iter()
+        .map(|c| c.find_target_index(params))
+        .collect();
+    let sources: Vec<Vec<usize>> = constraints
+        .iter()
+        .map(|c| c.find_source_indices(params))
+        .collect();
+
+    let mut order = Vec::with_capacity(constraints.len());
+    let mut placed = vec![false; constraints.len()];
+    while order.len() < constraints.len() {
+        // Ready: no unplaced constraint writes any of this constraint's sources
+        let ready = (0..constraints.len()).find(|&i| {
+            !placed[i]
+                && sources[i].iter().all(|&src| {
+                    (0..constraints.len()).all(|j| placed[j] || j == i || targets[j] != Some(src))
+                })
+        });
+        let next = ready.unwrap_or_else(|| (0..constraints.len()).find(|&i| !placed[i]).unwrap());
+        placed[next] = true;
+        order.push(next);
+    }
+
+    order
+}
+
 /// Validate and compile all constraints
 ///
 /// First checks for cyclic dependencies, then compiles all constraint expressions.
@@ -80,3 +113,48 @@ pub fn validate_constraints(
 
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::core::types::RelationshipType;
+
+    fn param(name: &str) -> Parameter {
+        Parameter {
+            name: name.to_string(),
+            value: 1.0,
+            min_val: 0.0,
+            max_val: 10.0,
+        }
+    }
+
+    fn equals(target: &str, source: &str) -> ParameterConstraint {
+        ParameterConstraint {
+            relationship: RelationshipType::Equals,
+            description: String::new(),
+            expression: source.to_string(),
+            target_param: param(target),
+            source_params: vec![param(source)],
+            compiled: None,
+        }
+    }
+
+    #[test]
+    fn chained_constraints_run_after_their_sources() {
+        let params = vec![param("a"), param("b"), param("c")];
+        // a = b, b = c: b must be set before a reads it
+        let constraints = vec![equals("a", "b"), equals("b", "c")];
+
+        assert_eq!(topological_order(&constraints, &params), vec![1, 0]);
+        assert!(detect_cycles(&constraints, &params).is_ok());
+    }
+
+    #[test]
+    fn cyclic_constraints_keep_their_order() {
+        let params = vec![param("a"), param("b")];
+        let constraints = vec![equals("a", "b"), equals("b", "a")];
+
+        assert_eq!(topological_order(&constraints, &params), vec![0, 1]);
+        assert!(detect_cycles(&constraints, &params).is_err());
+    }
+}
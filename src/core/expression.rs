@@ -24,6 +24,11 @@ pub struct CompiledExpression {
 }
 
 impl CompiledExpression {
+    /// Compile an expression whose identifiers index into `param_names`
+    pub fn compile(expr: &str, param_names: &[String]) -> Result<Self, String> {
+        Compiler::new(param_names).compile(expr)
+    }
+
     /// Internal evaluation - returns static error strings
     #[inline]
     pub fn evaluate(&self, params: &[f64]) -> Result<f64, &'static str> {
@@ -93,8 +98,7 @@ impl CompiledExpression {
 impl CompiledExpression {
     #[new]
     pub fn new(expr: String, param_names: Vec<String>) -> PyResult<Self> {
-        Compiler::new(&param_names)
-            .compile(&expr)
+        Self::compile(&expr, &param_names)
             .map_err(|e| PyValueError::new_err(format!("Expression compilation failed: {}", e)))
     }
 
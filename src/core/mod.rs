@@ -2,6 +2,6 @@ pub mod constraints;
 pub mod expression;
 pub mod types;
 
-pub use constraints::{detect_cycles, validate_constraints};
+pub use constraints::{detect_cycles, topological_order, validate_constraints};
 pub use expression::*;
 pub use types::*;
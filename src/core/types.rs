@@ -1,6 +1,7 @@
 use crate::expression::CompiledExpression;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use std::collections::BTreeMap;
 
 // ===== ENUMS =====
 
@@ -63,6 +64,17 @@ impl Environment {
     fn new(name: String, value: String) -> Self {
         Self { name, value }
     }
+
+    fn __eq__(&self, other: &Self) -> bool {
+        self.key() == other.key()
+    }
+}
+
+impl Environment {
+    /// Value tuple used for equality
+    fn key(&self) -> (&str, &str) {
+        (&self.name, &self.value)
+    }
 }
 
 #[pyclass]
@@ -97,6 +109,22 @@ impl Parameter {
     pub fn is_within_bounds(&self) -> bool {
         self.value >= self.min_val && self.value <= self.max_val
     }
+
+    fn __eq__(&self, other: &Self) -> bool {
+        self.key() == other.key()
+    }
+}
+
+impl Parameter {
+    /// Value tuple used for equality
+    fn key(&self) -> (&str, u64, u64, u64) {
+        (
+            &self.name,
+            self.value.to_bits(),
+            self.min_val.to_bits(),
+            self.max_val.to_bits(),
+        )
+    }
 }
 
 #[pyclass]
@@ -147,6 +175,23 @@ impl Target {
         };
         error * self.weight
     }
+
+    fn __eq__(&self, other: &Self) -> bool {
+        self.key() == other.key()
+    }
+}
+
+impl Target {
+    /// Value tuple used for equality
+    fn key(&self) -> (&str, u64, u64, TargetMode, &str) {
+        (
+            &self.metric,
+            self.value.to_bits(),
+            self.weight.to_bits(),
+            self.mode,
+            &self.unit,
+        )
+    }
 }
 
 #[pyclass]
@@ -160,24 +205,47 @@ pub struct Test {
     pub description: String,
     #[pyo3(get)]
     pub environment: Vec<Environment>,
+    /// Keep the analysis exactly as written (no sweep narrowing during optimization)
+    #[pyo3(get, set)]
+    pub high_fidelity: bool,
 }
 
 #[pymethods]
 impl Test {
     #[new]
+    #[pyo3(signature = (name, environment, spice_code, description, high_fidelity=false))]
     fn new(
         name: String,
         environment: Vec<Environment>,
         spice_code: String,
         description: String,
+        high_fidelity: bool,
     ) -> Self {
         Self {
             name,
             spice_code,
             description,
             environment,
+            high_fidelity,
         }
     }
+
+    fn __eq__(&self, other: &Self) -> bool {
+        self.key() == other.key()
+    }
+}
+
+impl Test {
+    /// Value tuple used for equality
+    fn key(&self) -> (&str, &str, &str, Vec<(&str, &str)>, bool) {
+        (
+            &self.name,
+            &self.spice_code,
+            &self.description,
+            self.environment.iter().map(Environment::key).collect(),
+            self.high_fidelity,
+        )
+    }
 }
 
 #[pyclass]
@@ -317,24 +385,50 @@ pub struct OptimizationResult {
     pub message: String,
     #[pyo3(get)]
     pub parameters: Vec<Parameter>,
+    /// Non-dominated trade-off designs found across all targets
+    #[pyo3(get)]
+    pub pareto_front: Vec<Vec<Parameter>>,
+    /// Final parameters grouped by component (name up to the last '_', e.g. "XM1")
+    #[pyo3(get)]
+    pub parameters_by_group: BTreeMap<String, Vec<Parameter>>,
+}
+
+/// Group parameters by component name (the part before the last '_') in one pass
+pub fn group_parameters(parameters: &[Parameter]) -> BTreeMap<String, Vec<Parameter>> {
+    let mut groups: BTreeMap<String, Vec<Parameter>> = BTreeMap::new();
+    for param in parameters {
+        let group = param
+            .name
+            .rfind('_')
+            .map_or(param.name.as_str(), |pos| &param.name[..pos]);
+        groups
+            .entry(group.to_string())
+            .or_default()
+            .push(param.clone());
+    }
+    groups
 }
 
 #[pymethods]
 impl OptimizationResult {
     #[new]
+    #[pyo3(signature = (success, parameters, cost, iterations, message, pareto_front=Vec::new()))]
     fn new(
         success: bool,
         parameters: Vec<Parameter>,
         cost: f64,
         iterations: u32,
         message: String,
+        pareto_front: Vec<Vec<Parameter>>,
     ) -> Self {
         Self {
             success,
             cost,
             iterations,
             message,
+            parameters_by_group: group_parameters(&parameters),
             parameters,
+            pareto_front,
         }
     }
 
@@ -59,9 +59,7 @@ impl CircuitOptimizationCallback {
         // Safety: problem pointer is valid for the lifetime of this callback
         unsafe {
             let problem = &*self.problem;
-            problem.update_parameters(params)?;
-            problem.execute_measurements()?;
-            let metrics = problem.extract_metrics()?;
+            let metrics = problem.metrics(params)?;
 
             for target in &self.targets {
                 let current = metrics.get(&target.metric).unwrap_or(&0.0);
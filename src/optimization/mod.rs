@@ -4,5 +4,8 @@ pub mod solvers;
 
 pub use callback::CircuitOptimizationCallback;
 pub use problem::CircuitProblem;
-pub use solvers::{select_solver, CMAESOptimizer, NewtonOptimizer, ParticleOptimizer};
-pub use solvers::{Problem, Solver, SolverResult};
+pub use solvers::{
+    select_solver, solver_factory, validate_solver_name, CMAESOptimizer, NewtonOptimizer,
+    ParticleOptimizer,
+};
+pub use solvers::{CostJob, Problem, Solver, SolverResult};
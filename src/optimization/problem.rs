@@ -1,10 +1,10 @@
 use crate::core::*;
-use crate::optimization::solvers::traits::{OptimizationCallback, Problem};
+use crate::optimization::solvers::traits::{CostJob, OptimizationCallback, Problem};
 use crate::optimizer::NGSPICE_OUTPUT;
-use crate::simulation::NgSpice;
+use crate::simulation::{narrow_ac_sweep, scratch_dir, NgSpice, NgSpiceBatch};
 use pyo3::Python;
 use std::cell::RefCell;
-use std::collections::HashMap;
+use std::collections::{HashMap, VecDeque};
 use std::io::Write;
 use std::path::PathBuf;
 
@@ -14,6 +14,9 @@ const VERBOSITY_FULL: bool = false;
 const SKY130_GRID_SIZE: f64 = 0.005e-6;
 const SKY130_GRID_INV: f64 = 1.0 / SKY130_GRID_SIZE;
 
+/// Maximum number of simulated parameter sets kept in the metrics cache
+const METRICS_CACHE_CAPACITY: usize = 4096;
+
 /// Format duration in seconds to human-readable string (e.g., "2m 30s", "1h 15m")
 fn format_duration(secs: f64) -> String {
     if secs < 60.0 {
@@ -32,8 +35,100 @@ fn format_duration(secs: f64) -> String {
 struct ConstraintData {
     relationship: RelationshipType,
     target_idx: usize,
-    source_indices: Vec<usize>,
-    compiled: Option<crate::expression::CompiledExpression>,
+    /// Expression compiled against the full parameter list, so it reads
+    /// source values straight from a particle's parameter row
+    compiled: crate::expression::CompiledExpression,
+}
+
+/// Measured metrics (in target order) keyed by parameter set quantized to the Sky130 grid
+///
+/// Swarm particles and the progress callback revisit the same (grid-snapped)
+/// parameter sets, so repeat visits skip the simulation entirely. Entries are
+/// evicted oldest-first once the cache is full.
+struct MetricsCache {
+    entries: HashMap<Vec<i64>, Vec<f64>>,
+    order: VecDeque<Vec<i64>>,
+}
+
+impl MetricsCache {
+    fn new() -> Self {
+        Self {
+            entries: HashMap::new(),
+            order: VecDeque::new(),
+        }
+    }
+
+    fn key(params: &[f64]) -> Vec<i64> {
+        params
+            .iter()
+            .map(|&p| (p * SKY130_GRID_INV).round() as i64)
+            .collect()
+    }
+
+    fn get(&self, key: &[i64]) -> Option<&Vec<f64>> {
+        self.entries.get(key)
+    }
+
+    fn insert(&mut self, key: Vec<i64>, metrics: Vec<f64>) {
+        if self.entries.contains_key(&key) {
+            return;
+        }
+        if self.entries.len() >= METRICS_CACHE_CAPACITY {
+            if let Some(oldest) = self.order.pop_front() {
+                self.entries.remove(&oldest);
+            }
+        }
+        self.order.push_back(key.clone());
+        self.entries.insert(key, metrics);
+    }
+}
+
+/// A target specialized into branch-free arithmetic
+///
+/// Every mode is an interval `[lo, hi]` the value should fall in: Min is
+/// `(-inf, target]`, Max is `[target, inf)` and Target is `[target, target]`,
+/// so the weighted error is `weight * (max(0, x - hi) + max(0, lo - x))`.
+struct CostTerm {
+    lo: f64,
+    hi: f64,
+    weight: f64,
+    /// Value substituted when the measurement is missing
+    ///
+    /// Lies one target magnitude outside `[lo, hi]`, so a missing or
+    /// non-finite measurement always costs `weight * max(|target|, 1)`.
+    penalty: f64,
+}
+
+impl CostTerm {
+    fn new(target: &Target) -> Self {
+        let miss = target.value.abs().max(1.0);
+        let (lo, hi, penalty) = match target.mode {
+            TargetMode::Min => (f64::NEG_INFINITY, target.value, target.value + miss),
+            TargetMode::Max => (target.value, f64::INFINITY, target.value - miss),
+            TargetMode::Target => (target.value, target.value, target.value + miss),
+        };
+        Self {
+            lo,
+            hi,
+            weight: target.weight,
+            penalty,
+        }
+    }
+
+    /// Weighted error of a measured value (0 when satisfied)
+    #[inline]
+    fn error(&self, value: f64) -> f64 {
+        self.weight * ((value - self.hi).max(0.0) + (self.lo - value).max(0.0))
+    }
+}
+
+/// An evaluation running on the worker pool (see `cost_as_completed`)
+struct RunningEval {
+    id: usize,
+    params: Vec<f64>,
+    cutoff: f64,
+    /// Output of the operating-point phase once it has run (`None` while it runs)
+    first: Option<String>,
 }
 
 /// Iteration result for tracking optimization progress
@@ -48,16 +143,27 @@ pub struct CircuitProblem {
     params: Vec<f64>,
     bounds: Vec<(f64, f64)>,
     constraints: Vec<ConstraintData>,
+    /// Indices of every parameter read by some constraint (sorted, unique)
+    constraint_sources: Vec<usize>,
+    /// Indices of parameters set by `Equals` constraints (sorted, unique)
+    dependent_params: Vec<usize>,
     targets: Vec<Target>,
+    /// Targets specialized for cost evaluation, in target order
+    cost_terms: Vec<CostTerm>,
+    /// Output variable carrying each target's value (`{metric}_val`, lowercase)
+    metric_vars: Vec<String>,
 
     pub ngspice: RefCell<NgSpice>,
     tests: Vec<Test>,
 
+    batch: Option<NgSpiceBatch>,
+
     param_names: Vec<String>,
     temp_netlist_path: PathBuf,
     verbose: bool,
 
     constraint_cache: RefCell<Option<(u64, Vec<f64>)>>,
+    metrics_cache: RefCell<MetricsCache>,
 }
 
 impl CircuitProblem {
@@ -73,10 +179,18 @@ impl CircuitProblem {
         let params: Vec<f64> = parameters.iter().map(|p| p.value).collect();
         let bounds: Vec<(f64, f64)> = parameters.iter().map(|p| (p.min_val, p.max_val)).collect();
         let param_names: Vec<String> = parameters.iter().map(|p| p.name.clone()).collect();
+        let metric_vars: Vec<String> = targets
+            .iter()
+            .map(|t| format!("{}_val", t.metric.to_lowercase()))
+            .collect();
 
-        // Build constraint data
+        // Build constraint data in dependency order, so chained constraints are
+        // satisfied in a single sequential pass
         let mut constraint_data = Vec::with_capacity(constraints.len());
-        for constraint in constraints {
+        let mut constraint_sources = Vec::new();
+        let mut dependent_params = Vec::new();
+        for &k in &topological_order(&constraints, &parameters) {
+            let constraint = &constraints[k];
             let target_idx = parameters
                 .iter()
                 .position(|p| p.name == constraint.target_param.name)
@@ -93,17 +207,47 @@ impl CircuitProblem {
             if source_indices.len() != constraint.source_params.len() {
                 return Err("Source parameter not found".into());
             }
-
+            constraint_sources.extend(source_indices);
+
+            let compiled = crate::expression::CompiledExpression::compile(
+                &constraint.expression,
+                &param_names,
+            )
+            .map_err(|e| {
+                format!(
+                    "Failed to compile expression '{}' for constraint on '{}': {}",
+                    constraint.expression, constraint.target_param.name, e
+                )
+            })?;
+
+            if constraint.relationship == RelationshipType::Equals {
+                dependent_params.push(target_idx);
+            }
             constraint_data.push(ConstraintData {
                 relationship: constraint.relationship,
                 target_idx,
-                source_indices,
-                compiled: constraint.compiled.clone(),
+                compiled,
             });
         }
+        constraint_sources.sort_unstable();
+        constraint_sources.dedup();
+        dependent_params.sort_unstable();
+        dependent_params.dedup();
 
         // Merge tests with identical environments AND analysis types to reduce simulation overhead
-        let processed_tests = Self::merge_tests_by_environment(&tests, verbose)?;
+        let mut processed_tests = Self::merge_tests_by_environment(&tests, verbose)?;
+        // Run cheap analyses first so hopeless parameter sets are rejected early
+        processed_tests.sort_by_key(Self::analysis_rank);
+
+        // Sweep only the frequencies each (merged) AC test actually measures
+        for test in processed_tests.iter_mut().filter(|t| !t.high_fidelity) {
+            if let Some(narrowed) = narrow_ac_sweep(&test.spice_code) {
+                test.spice_code = narrowed;
+                if verbose {
+                    println!("  Narrowed AC sweep for: {}", test.name);
+                }
+            }
+        }
 
         // Parameterize netlist
         let mut modified_netlist = Vec::new();
@@ -185,8 +329,8 @@ impl CircuitProblem {
             modified_netlist.push(".end".to_string());
         }
 
-        // Write to temporary file and load into NgSpice
-        let temp_dir = std::env::temp_dir();
+        // Write to temporary file (tmpfs when available) and load into NgSpice
+        let temp_dir = scratch_dir();
         let temp_netlist_path = temp_dir.join(format!("ngspice_opt_{}.spice", std::process::id()));
         let mut file = std::fs::File::create(&temp_netlist_path)
             .map_err(|e| format!("Failed to create temp file: {}", e))?;
@@ -211,15 +355,37 @@ impl CircuitProblem {
             bounds,
             param_names,
             constraints: constraint_data,
+            constraint_sources,
+            dependent_params,
             ngspice: RefCell::new(ngspice),
             tests: processed_tests,
+            batch: None,
+            metric_vars,
+            cost_terms: targets.iter().map(CostTerm::new).collect(),
             targets,
             temp_netlist_path,
             verbose,
             constraint_cache: RefCell::new(None),
+            metrics_cache: RefCell::new(MetricsCache::new()),
         })
     }
 
+    /// Evaluate concurrently on `n_workers` separate ngspice processes (1 = serial)
+    pub fn with_workers(mut self, n_workers: usize) -> Result<Self, String> {
+        self.batch = if n_workers > 1 {
+            Some(NgSpiceBatch::new(n_workers, &self.temp_netlist_path)?)
+        } else {
+            None
+        };
+        if self.verbose {
+            if let Some(batch) = &self.batch {
+                println!("  Workers: {}", batch.workers());
+            }
+        }
+
+        Ok(self)
+    }
+
     /// Get the last NgSpice output (useful for debugging)
     pub fn get_ngspice_output(&self) -> Result<Vec<String>, String> {
         let output = NGSPICE_OUTPUT
@@ -249,8 +415,7 @@ impl CircuitProblem {
 
         // Execute alterparam commands one by one
         let ngspice = self.ngspice.borrow();
-        for (name, &value) in self.param_names.iter().zip(params.iter()) {
-            let cmd = format!("alterparam {} = {}", name.to_lowercase(), value);
+        for cmd in self.parameter_commands(params) {
             ngspice
                 .command(&cmd)
                 .map_err(|e| format!("Failed to execute '{}': {}", cmd, e))?;
@@ -264,141 +429,281 @@ impl CircuitProblem {
         let ngspice = self.ngspice.borrow();
 
         for test in &self.tests {
-            // Apply environment settings
-            for env in &test.environment {
-                let env_cmd = match env.name.to_lowercase().as_str() {
-                    "temp" | "temperature" => format!("set temp = {}", env.value),
-                    _ => format!("alterparam {} = {}", env.name.to_lowercase(), env.value),
-                };
-                ngspice
-                    .command(&env_cmd)
-                    .map_err(|e| format!("Failed to set environment '{}': {}", env.name, e))?;
-            }
-
-            // Reset simulation state
-            ngspice
-                .command("reset")
-                .map_err(|e| format!("Failed to reset: {}", e))?;
+            Self::run_test(&ngspice, test)?;
+        }
 
-            // Run analysis (find and execute .ac, .dc, .tran, or .op directive)
-            let analysis_line = test
-                .spice_code
-                .lines()
-                .find(|line| {
-                    let t = line.trim();
-                    t.starts_with(".ac ")
-                        || t.starts_with(".dc ")
-                        || t.starts_with(".tran ")
-                        || t.starts_with(".op")
-                })
-                .ok_or_else(|| format!("No analysis directive in test '{}'", test.name))?;
+        Ok(())
+    }
 
+    /// Run a single test on the loaded circuit
+    fn run_test(ngspice: &NgSpice, test: &Test) -> Result<(), String> {
+        for cmd in Self::test_commands(test)? {
             ngspice
-                .command(&analysis_line.trim()[1..]) // Remove leading '.'
-                .map_err(|e| format!("Failed to run analysis in '{}': {}", test.name, e))?;
-
-            // Execute measurement commands (skip directives, comments, control blocks)
-            for line in test.spice_code.lines() {
-                let trimmed = line.trim();
-                if !trimmed.is_empty()
-                    && !trimmed.starts_with('*')
-                    && !trimmed.starts_with('.')
-                    && trimmed != "run"
-                {
-                    ngspice
-                        .command(trimmed)
-                        .map_err(|e| format!("Failed to execute '{}': {}", trimmed, e))?;
-                }
-            }
+                .command(&cmd)
+                .map_err(|e| format!("Failed to execute '{}' in '{}': {}", cmd, test.name, e))?;
         }
-
         Ok(())
     }
 
-    /// Extract metrics from NgSpice output
-    pub fn extract_metrics(&self) -> Result<HashMap<String, f64>, String> {
+    /// Extract metrics from NgSpice output, in target order
+    pub fn extract_metrics(&self) -> Result<Vec<f64>, String> {
+        Ok(self.with_penalties(&self.output_metric_values()?))
+    }
+
+    /// Target values measured so far in the NgSpice output, in target order
+    fn output_metric_values(&self) -> Result<Vec<Option<f64>>, String> {
         let output = NGSPICE_OUTPUT
             .lock()
             .map_err(|e| format!("Failed to lock output: {}", e))?;
 
-        // Parse measurement values (single pass, indexed by target)
-        let mut metric_values: Vec<Option<f64>> = vec![None; self.targets.len()];
+        Ok(self.parse_metric_values(output.iter().map(String::as_str)))
+    }
+
+    /// Simulate a parameter set and return its metrics by name, reusing cached results
+    pub fn metrics(&self, params: &[f64]) -> Result<HashMap<String, f64>, String> {
+        let values = self.metric_values(params)?;
+        Ok(self
+            .targets
+            .iter()
+            .map(|target| target.metric.clone())
+            .zip(values)
+            .collect())
+    }
+
+    /// Simulate a parameter set and return its metrics in target order, reusing
+    /// cached results
+    fn metric_values(&self, params: &[f64]) -> Result<Vec<f64>, String> {
+        let key = MetricsCache::key(params);
+        if let Some(metrics) = self.metrics_cache.borrow().get(&key) {
+            return Ok(metrics.clone());
+        }
 
-        for line in output.iter() {
+        self.update_parameters(params)?;
+        self.execute_measurements()?;
+        let metrics = self.extract_metrics()?;
+
+        self.metrics_cache.borrow_mut().insert(key, metrics.clone());
+        Ok(metrics)
+    }
+
+    /// alterparam commands that apply a parameter set to the loaded circuit
+    fn parameter_commands(&self, params: &[f64]) -> Vec<String> {
+        self.param_names
+            .iter()
+            .zip(params.iter())
+            .map(|(name, &value)| format!("alterparam {} = {}", name.to_lowercase(), value))
+            .collect()
+    }
+
+    /// Commands that run one test: environment, reset, analysis, then measurements
+    fn test_commands(test: &Test) -> Result<Vec<String>, String> {
+        let mut cmds = Vec::new();
+
+        // Apply environment settings
+        for env in &test.environment {
+            cmds.push(match env.name.to_lowercase().as_str() {
+                "temp" | "temperature" => format!("set temp = {}", env.value),
+                _ => format!("alterparam {} = {}", env.name.to_lowercase(), env.value),
+            });
+        }
+
+        // Reset simulation state
+        cmds.push("reset".to_string());
+
+        // Run analysis (find and execute .ac, .dc, .tran, or .op directive)
+        let analysis_line = test
+            .spice_code
+            .lines()
+            .find(|line| {
+                let t = line.trim();
+                t.starts_with(".ac ")
+                    || t.starts_with(".dc ")
+                    || t.starts_with(".tran ")
+                    || t.starts_with(".op")
+            })
+            .ok_or_else(|| format!("No analysis directive in test '{}'", test.name))?;
+        cmds.push(analysis_line.trim()[1..].to_string()); // Remove leading '.'
+
+        // Measurement commands (skip directives, comments, control blocks)
+        for line in test.spice_code.lines() {
             let trimmed = line.trim();
-            if !trimmed.contains('=') {
+            if !trimmed.is_empty()
+                && !trimmed.starts_with('*')
+                && !trimmed.starts_with('.')
+                && trimmed != "run"
+            {
+                cmds.push(trimmed.to_string());
+            }
+        }
+
+        Ok(cmds)
+    }
+
+    /// Cost rank of a test's analysis (cheapest first: op, dc, ac, tran)
+    fn analysis_rank(test: &Test) -> u8 {
+        test.spice_code
+            .lines()
+            .map(str::trim)
+            .find_map(|t| {
+                if t.starts_with(".op") {
+                    Some(0)
+                } else if t.starts_with(".dc ") {
+                    Some(1)
+                } else if t.starts_with(".ac ") {
+                    Some(2)
+                } else if t.starts_with(".tran ") {
+                    Some(3)
+                } else {
+                    None
+                }
+            })
+            .unwrap_or(4)
+    }
+
+    /// Number of leading operating-point tests (run first when rows may stop early)
+    fn leading_op_tests(&self) -> usize {
+        self.tests
+            .iter()
+            .take_while(|test| Self::analysis_rank(test) == 0)
+            .count()
+    }
+
+    /// Turn the next queued job into a tagged worker script
+    ///
+    /// Jobs whose metrics are already cached are reported straight away (which
+    /// may queue further jobs) until one needs a simulation.
+    fn schedule(
+        &self,
+        mut job: Option<CostJob>,
+        running: &mut HashMap<usize, RunningEval>,
+        next_tag: &mut usize,
+        on_done: &mut dyn FnMut(usize, f64) -> Result<Option<CostJob>, String>,
+    ) -> Result<Option<(usize, String)>, String> {
+        while let Some((id, params, cutoff)) = job {
+            let cached = self
+                .metrics_cache
+                .borrow()
+                .get(&MetricsCache::key(&params))
+                .map(|metrics| self.metrics_cost(metrics));
+            if let Some(cost) = cached {
+                job = on_done(id, cost)?;
                 continue;
             }
 
-            // Check each target (typically 1-5 targets, so linear scan is fine)
-            for (i, target) in self.targets.iter().enumerate() {
-                let metric_lower = target.metric.to_lowercase();
-                if trimmed.contains(&metric_lower) && trimmed.contains("_val") {
-                    if let Some(eq_pos) = trimmed.find('=') {
-                        if let Some(value_str) =
-                            trimmed[eq_pos + 1..].trim().split_whitespace().next()
+            let split = self.leading_op_tests();
+            let two_phase = split > 0 && split < self.tests.len() && cutoff.is_finite();
+            let tests = if two_phase {
+                &self.tests[..split]
+            } else {
+                &self.tests[..]
+            };
+            let script = self.build_script(&params, tests)?;
+
+            let tag = *next_tag;
+            *next_tag += 1;
+            running.insert(
+                tag,
+                RunningEval {
+                    id,
+                    params,
+                    cutoff,
+                    first: (!two_phase).then(String::new),
+                },
+            );
+            return Ok(Some((tag, script)));
+        }
+        Ok(None)
+    }
+
+    /// Build the control script that runs the given tests for a parameter set
+    ///
+    /// Workers already have the circuit loaded, so a script only applies the
+    /// parameters with `alterparam` and runs each test's commands.
+    fn build_script(&self, params: &[f64], tests: &[Test]) -> Result<String, String> {
+        let mut script = self.parameter_commands(params).join("\n");
+        for test in tests {
+            for cmd in Self::test_commands(test)? {
+                script.push('\n');
+                script.push_str(&cmd);
+            }
+        }
+
+        Ok(script)
+    }
+
+    /// Parse measurement values out of ngspice output lines
+    fn parse_metrics<'a>(&self, lines: impl Iterator<Item = &'a str>) -> Vec<f64> {
+        self.with_penalties(&self.parse_metric_values(lines))
+    }
+
+    /// Parse the target values present in ngspice output lines, in target order
+    fn parse_metric_values<'a>(&self, lines: impl Iterator<Item = &'a str>) -> Vec<Option<f64>> {
+        // Parse measurement values (single pass, indexed by target)
+        let mut metric_values: Vec<Option<f64>> = vec![None; self.targets.len()];
+
+        for line in lines {
+            // Lines look like "[stdout] name = value ..."; match the name exactly
+            if let Some((lhs, rhs)) = line.split_once('=') {
+                if let Some(name) = lhs.split_whitespace().last() {
+                    // Typically 1-5 targets, so linear scan is fine
+                    if let Some(i) = self
+                        .metric_vars
+                        .iter()
+                        .position(|var| var.eq_ignore_ascii_case(name))
+                    {
+                        // Non-finite results count as missing (and are penalized)
+                        if let Some(Ok(value)) =
+                            rhs.split_whitespace().next().map(str::parse::<f64>)
                         {
-                            if let Ok(value) = value_str.parse::<f64>() {
-                                metric_values[i] = Some(value);
-                            }
+                            metric_values[i] = Some(value).filter(|v| v.is_finite());
                         }
                     }
                 }
             }
         }
-        drop(output);
-
-        // Build results map with penalties for missing metrics
-        let mut metrics = HashMap::with_capacity(self.targets.len());
-        for (i, target) in self.targets.iter().enumerate() {
-            let value = metric_values[i].unwrap_or_else(|| {
-                // Penalty for missing measurement
-                match target.mode {
-                    TargetMode::Min => target.value * 0.1,
-                    TargetMode::Max => target.value * 10.0,
-                    TargetMode::Target => target.value * 2.0,
-                }
-            });
-            metrics.insert(target.metric.clone(), value);
-        }
 
-        Ok(metrics)
+        metric_values
     }
 
-    /// Get targets (for callback access)
-    pub fn targets(&self) -> &[Target] {
-        &self.targets
+    /// Fill in penalties for missing measurements
+    fn with_penalties(&self, metric_values: &[Option<f64>]) -> Vec<f64> {
+        self.cost_terms
+            .iter()
+            .zip(metric_values.iter())
+            .map(|(term, value)| value.unwrap_or(term.penalty))
+            .collect()
     }
 
-    /// Get parameter names (for callback access)
-    pub fn param_names(&self) -> &[String] {
-        &self.param_names
+    /// Weighted error of each target, in target order (0 when satisfied)
+    fn target_errors<'a>(&'a self, metrics: &'a [f64]) -> impl Iterator<Item = f64> + 'a {
+        self.cost_terms
+            .iter()
+            .zip(metrics.iter())
+            .map(|(term, &value)| term.error(value))
     }
 
-    /// Evaluate all constraints (helper for apply_constraints)
-    fn evaluate_all_constraints(&self, params: &[f64]) -> Result<Vec<f64>, String> {
-        let mut results = Vec::with_capacity(self.constraints.len());
-        let max_sources = self
-            .constraints
+    /// Cost of the targets measured so far (a lower bound on the full cost)
+    fn partial_cost(&self, metric_values: &[Option<f64>]) -> f64 {
+        self.cost_terms
             .iter()
-            .map(|c| c.source_indices.len())
-            .max()
-            .unwrap_or(0);
-        let mut source_values = Vec::with_capacity(max_sources);
+            .zip(metric_values.iter())
+            .filter_map(|(term, value)| value.map(|v| term.error(v)))
+            .sum()
+    }
 
-        for constraint in &self.constraints {
-            source_values.clear();
-            source_values.extend(constraint.source_indices.iter().map(|&idx| params[idx]));
+    /// Compute weighted cost from all targets
+    fn metrics_cost(&self, metrics: &[f64]) -> f64 {
+        self.target_errors(metrics).sum()
+    }
 
-            let expr = constraint
-                .compiled
-                .as_ref()
-                .ok_or("Constraint not compiled")?;
-            let computed = expr.evaluate(&source_values).map_err(|e| e.to_string())?;
-            results.push(computed);
-        }
+    /// Get targets (for callback access)
+    pub fn targets(&self) -> &[Target] {
+        &self.targets
+    }
 
-        Ok(results)
+    /// Get parameter names (for callback access)
+    pub fn param_names(&self) -> &[String] {
+        &self.param_names
     }
 
     /// Merge tests with identical environments AND analysis types
@@ -474,6 +779,7 @@ impl CircuitProblem {
                         spice_code: processed_code,
                         description: test.description.clone(),
                         environment: test.environment.clone(),
+                        high_fidelity: test.high_fidelity,
                     }
                 })
                 .collect();
@@ -543,6 +849,7 @@ impl CircuitProblem {
                             .join(", ")
                     ),
                     environment: first_test.environment.clone(),
+                    high_fidelity: processed_group.iter().any(|t| t.high_fidelity),
                 });
             }
         }
@@ -554,29 +861,124 @@ impl CircuitProblem {
 // Implement Problem trait
 impl Problem for CircuitProblem {
     fn cost(&self, params: &[f64]) -> Result<f64, String> {
-        // Run simulation with updated parameters
+        // Run simulation with updated parameters (or reuse a cached run)
+        let metrics = self.metric_values(params)?;
+
+        Ok(self.metrics_cost(&metrics))
+    }
+
+    fn cost_bounded(&self, params: &[f64], cutoff: f64) -> Result<f64, String> {
+        let key = MetricsCache::key(params);
+        if cutoff.is_infinite() || self.metrics_cache.borrow().get(&key).is_some() {
+            return self.cost(params);
+        }
+
         self.update_parameters(params)?;
-        self.execute_measurements()?;
+        {
+            let ngspice = self.ngspice.borrow();
+            for (t, test) in self.tests.iter().enumerate() {
+                Self::run_test(&ngspice, test)?;
+
+                // Stop once the targets measured so far already exceed the cutoff
+                // (partial results are never cached)
+                if t + 1 < self.tests.len() {
+                    let partial = self.partial_cost(&self.output_metric_values()?);
+                    if partial > cutoff {
+                        return Ok(partial);
+                    }
+                }
+            }
+        }
         let metrics = self.extract_metrics()?;
+        let cost = self.metrics_cost(&metrics);
 
-        // Compute weighted cost from all targets
-        let total_cost = self
-            .targets
-            .iter()
-            .filter_map(|target| {
-                metrics.get(&target.metric).map(|&value| {
-                    let error = match target.mode {
-                        TargetMode::Min if value >= target.value => value - target.value,
-                        TargetMode::Max if value <= target.value => target.value - value,
-                        TargetMode::Target => (value - target.value).abs(),
-                        _ => 0.0, // Target satisfied
-                    };
-                    error * target.weight
-                })
-            })
-            .sum();
+        self.metrics_cache.borrow_mut().insert(key, metrics);
+        Ok(cost)
+    }
+
+    fn concurrency(&self) -> usize {
+        self.batch.as_ref().map_or(1, NgSpiceBatch::workers)
+    }
+
+    fn cost_as_completed(
+        &self,
+        jobs: Vec<CostJob>,
+        on_done: &mut dyn FnMut(usize, f64) -> Result<Option<CostJob>, String>,
+    ) -> Result<(), String> {
+        let batch = match &self.batch {
+            Some(batch) => batch,
+            None => {
+                let mut queue: VecDeque<CostJob> = jobs.into();
+                while let Some((id, params, cutoff)) = queue.pop_front() {
+                    let cost = self.cost_bounded(&params, cutoff)?;
+                    queue.extend(on_done(id, cost)?);
+                }
+                return Ok(());
+            }
+        };
+
+        let mut running: HashMap<usize, RunningEval> = HashMap::new();
+        let mut next_tag = 0;
+        let mut scripts = Vec::with_capacity(jobs.len());
+        for job in jobs {
+            scripts.extend(self.schedule(Some(job), &mut running, &mut next_tag, on_done)?);
+        }
+
+        let split = self.leading_op_tests();
+        batch.run_as_completed(scripts, &mut |tag, output| {
+            let eval = running
+                .remove(&tag)
+                .ok_or_else(|| "Unknown NgSpice batch job".to_string())?;
+
+            let next = match eval.first {
+                // Operating point done: stop early, or run the remaining tests
+                // on the same worker
+                None => {
+                    let partial = self.partial_cost(&self.parse_metric_values(output.lines()));
+                    if partial > eval.cutoff {
+                        on_done(eval.id, partial)?
+                    } else {
+                        let script = self.build_script(&eval.params, &self.tests[split..])?;
+                        running.insert(
+                            tag,
+                            RunningEval {
+                                first: Some(output),
+                                ..eval
+                            },
+                        );
+                        return Ok(Some((tag, script)));
+                    }
+                }
+                Some(first) => {
+                    let metrics = self.parse_metrics(first.lines().chain(output.lines()));
+                    let cost = self.metrics_cost(&metrics);
+                    self.metrics_cache
+                        .borrow_mut()
+                        .insert(MetricsCache::key(&eval.params), metrics);
+                    on_done(eval.id, cost)?
+                }
+            };
+            self.schedule(next, &mut running, &mut next_tag, on_done)
+        })
+    }
 
-        Ok(total_cost)
+    fn num_objectives(&self) -> usize {
+        // A problem without targets still has its (zero) scalar cost
+        self.targets.len().max(1)
+    }
+
+    fn objectives(&self, params: &[f64]) -> Result<Vec<f64>, String> {
+        let metrics = self.metric_values(params)?;
+        Ok(self.target_errors(&metrics).collect())
+    }
+
+    fn evaluated_objectives(&self, params: &[f64]) -> Result<Option<Vec<f64>>, String> {
+        // Full simulations are cached; early-stopped ones never are
+        Ok(self
+            .metrics_cache
+            .borrow()
+            .get(&MetricsCache::key(params))
+            .map(|metrics| self.target_errors(metrics).collect()))
     }
 
     fn num_params(&self) -> usize {
@@ -591,6 +993,10 @@ impl Problem for CircuitProblem {
         &self.bounds
     }
 
+    fn dependent_params(&self) -> &[usize] {
+        &self.dependent_params
+    }
+
     fn apply_constraints(&self, params: &mut [f64]) -> Result<(), String> {
         // Fast path: no constraints, just round to Sky130 grid
         if self.constraints.is_empty() {
@@ -600,42 +1006,36 @@ impl Problem for CircuitProblem {
             return Ok(());
         }
 
-        // Evaluate constraints (with caching)
-        let constraint_results = {
-            // Compute hash of source parameters only
-            let mut hasher = std::collections::hash_map::DefaultHasher::new();
-            for (i, &param) in params.iter().enumerate() {
-                if self
-                    .constraints
-                    .iter()
-                    .any(|c| c.source_indices.contains(&i))
-                {
-                    std::hash::Hash::hash(&param.to_bits(), &mut hasher);
-                }
-            }
-            let param_hash = std::hash::Hasher::finish(&hasher);
+        // Hash of the source parameters, which determine every constraint result
+        let mut hasher = std::collections::hash_map::DefaultHasher::new();
+        for &i in &self.constraint_sources {
+            std::hash::Hash::hash(&params[i].to_bits(), &mut hasher);
+        }
+        let param_hash = std::hash::Hasher::finish(&hasher);
+
+        // Reuse cached results for the same sources (cache hit - steal results)
+        let mut cache = self.constraint_cache.borrow_mut();
+        let cached = cache
+            .take()
+            .filter(|(cached_hash, _)| *cached_hash == param_hash)
+            .map(|(_, results)| results);
+        let mut results = Vec::with_capacity(self.constraints.len());
 
-            // Check cache
-            let mut cache = self.constraint_cache.borrow_mut();
-            if let Some((cached_hash, cached_results)) = cache.take() {
-                if cached_hash == param_hash {
-                    cached_results // Cache hit - steal results
-                } else {
-                    // Cache miss: evaluate all constraints
-                    let results = self.evaluate_all_constraints(params)?;
-                    *cache = Some((param_hash, results.clone()));
-                    results
+        // Apply constraints in dependency order, each evaluated on the row as
+        // updated by the constraints before it (projection onto `Equals` targets)
+        for (k, constraint) in self.constraints.iter().enumerate() {
+            let computed = match &cached {
+                Some(cached) => cached[k],
+                None => {
+                    let value = constraint
+                        .compiled
+                        .evaluate(params)
+                        .map_err(|e| e.to_string())?;
+                    results.push(value);
+                    value
                 }
-            } else {
-                // No cache: evaluate all constraints
-                let results = self.evaluate_all_constraints(params)?;
-                *cache = Some((param_hash, results.clone()));
-                results
-            }
-        };
+            };
 
-        // Apply constraint results to parameters
-        for (constraint, &computed) in self.constraints.iter().zip(constraint_results.iter()) {
             let target_idx = constraint.target_idx;
             let (min, max) = self.bounds[target_idx];
             let current = params[target_idx];
@@ -650,6 +1050,7 @@ impl Problem for CircuitProblem {
             }
             .clamp(min, max);
         }
+        *cache = Some((param_hash, cached.unwrap_or(results)));
 
         // Round all params to Sky130 grid
         for param in params.iter_mut() {
@@ -721,9 +1122,7 @@ impl CircuitOptimizationCallback {
         // Safety: problem pointer is valid for the lifetime of this callback
         unsafe {
             let problem = &*self.problem;
-            problem.update_parameters(params)?;
-            problem.execute_measurements()?;
-            let metrics = problem.extract_metrics()?;
+            let metrics = problem.metrics(params)?;
 
             for target in &self.targets {
                 let current = metrics.get(&target.metric).unwrap_or(&0.0);
@@ -809,3 +1208,37 @@ impl OptimizationCallback for CircuitOptimizationCallback {
         self.iteration_count >= self.max_iterations
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn term(value: f64, mode: TargetMode) -> CostTerm {
+        CostTerm::new(&Target {
+            metric: "gain".to_string(),
+            value,
+            weight: 2.0,
+            mode,
+            unit: String::new(),
+        })
+    }
+
+    #[test]
+    fn missing_measurement_is_penalized_in_every_mode() {
+        for value in [-40.0, 0.0, 0.5, 60.0] {
+            for mode in [TargetMode::Min, TargetMode::Max, TargetMode::Target] {
+                let term = term(value, mode);
+                let expected = 2.0 * value.abs().max(1.0);
+                assert_eq!(term.error(term.penalty), expected, "{value} {mode:?}");
+            }
+        }
+    }
+
+    #[test]
+    fn satisfied_targets_cost_nothing() {
+        assert_eq!(term(60.0, TargetMode::Min).error(50.0), 0.0);
+        assert_eq!(term(60.0, TargetMode::Max).error(70.0), 0.0);
+        assert_eq!(term(60.0, TargetMode::Target).error(60.0), 0.0);
+        assert_eq!(term(60.0, TargetMode::Min).error(65.0), 10.0);
+    }
+}
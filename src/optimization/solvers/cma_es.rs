@@ -1,4 +1,6 @@
 use super::traits::{OptimizationCallback, Problem, Solver, SolverResult};
+use rand::rngs::SmallRng;
+use rand::SeedableRng;
 use rand_distr::{Distribution, StandardNormal};
 
 pub struct CMAESOptimizer {
@@ -6,6 +8,7 @@ pub struct CMAESOptimizer {
     precision: f64,
     population_size: usize,
     sigma: f64,
+    seed: Option<u64>,
 }
 
 impl CMAESOptimizer {
@@ -15,6 +18,7 @@ impl CMAESOptimizer {
             precision,
             population_size: 0,
             sigma: 0.3,
+            seed: None,
         }
     }
 
@@ -28,6 +32,12 @@ impl CMAESOptimizer {
         self
     }
 
+    /// Seed the random number generator (default: seeded from OS entropy)
+    pub fn with_seed(mut self, seed: u64) -> Self {
+        self.seed = Some(seed);
+        self
+    }
+
     #[inline]
     fn clamp_params(&self, params: &mut [f64], bounds: &[(f64, f64)]) {
         for (i, &(min, max)) in bounds.iter().enumerate() {
@@ -41,6 +51,10 @@ impl Solver for CMAESOptimizer {
         "CMA-ES"
     }
 
+    fn set_seed(&mut self, seed: u64) {
+        self.seed = Some(seed);
+    }
+
     fn solve(
         &mut self,
         problem: &dyn Problem,
@@ -48,7 +62,10 @@ impl Solver for CMAESOptimizer {
     ) -> Result<SolverResult, String> {
         let n = problem.num_params();
         let bounds = problem.bounds();
-        let mut rng = rand::thread_rng();
+        let mut rng = match self.seed {
+            Some(seed) => SmallRng::seed_from_u64(seed),
+            None => SmallRng::from_entropy(),
+        };
 
         // Set population size if not specified
         if self.population_size == 0 {
@@ -143,6 +160,7 @@ impl Solver for CMAESOptimizer {
                     params: population[best_idx].clone(),
                     cost_evals,
                     grad_evals: 0,
+                    pareto_front: Vec::new(),
                 });
             }
 
@@ -155,6 +173,7 @@ impl Solver for CMAESOptimizer {
                     params: population[best_idx].clone(),
                     cost_evals,
                     grad_evals: 0,
+                    pareto_front: Vec::new(),
                 });
             }
 
@@ -211,6 +230,7 @@ impl Solver for CMAESOptimizer {
             params: mean,
             cost_evals,
             grad_evals: 0,
+            pareto_front: Vec::new(),
         })
     }
 }
@@ -1,13 +1,54 @@
 mod cma_es;
 mod newton;
+pub mod pareto;
 mod particle;
 pub mod traits;
 
-pub use traits::{Problem, Solver, SolverResult};
+pub use traits::{CostJob, Problem, Solver, SolverResult};
 pub use cma_es::CMAESOptimizer;
 pub use newton::NewtonOptimizer;
 pub use particle::ParticleOptimizer;
 
+/// Builds a solver from (max_iterations, precision)
+pub type SolverFactory = fn(u32, f64) -> Box<dyn Solver>;
+
+/// Solvers selectable by name; `"auto"` instead picks one with `select_solver`
+pub const SOLVER_REGISTRY: &[(&str, SolverFactory)] = &[
+    ("newton", |max_iter, precision| {
+        Box::new(NewtonOptimizer::new(max_iter, precision))
+    }),
+    ("cmaes", |max_iter, precision| {
+        Box::new(CMAESOptimizer::new(max_iter, precision))
+    }),
+    ("pso", |max_iter, precision| {
+        Box::new(ParticleOptimizer::new(max_iter, precision))
+    }),
+    ("mopso", |max_iter, precision| {
+        Box::new(ParticleOptimizer::new(max_iter, precision).with_pareto_leaders(true))
+    }),
+];
+
+/// Look up a registered solver by name
+pub fn solver_factory(name: &str) -> Option<SolverFactory> {
+    SOLVER_REGISTRY
+        .iter()
+        .find(|(registered, _)| *registered == name)
+        .map(|&(_, factory)| factory)
+}
+
+/// Check that `name` is "auto" or a registered solver
+pub fn validate_solver_name(name: &str) -> Result<(), String> {
+    if name == "auto" || solver_factory(name).is_some() {
+        return Ok(());
+    }
+    let names: Vec<&str> = SOLVER_REGISTRY.iter().map(|(n, _)| *n).collect();
+    Err(format!(
+        "Unknown solver '{}' (expected 'auto' or one of: {})",
+        name,
+        names.join(", ")
+    ))
+}
+
 pub fn select_solver(
     num_params: usize,
     bounds: &[(f64, f64)],
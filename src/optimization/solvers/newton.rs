@@ -151,6 +151,7 @@ impl Solver for NewtonOptimizer {
                     params,
                     cost_evals,
                     grad_evals,
+                    pareto_front: Vec::new(),
                 });
             }
 
@@ -163,6 +164,7 @@ impl Solver for NewtonOptimizer {
                     params,
                     cost_evals,
                     grad_evals,
+                    pareto_front: Vec::new(),
                 });
             }
 
@@ -175,6 +177,7 @@ impl Solver for NewtonOptimizer {
                     params,
                     cost_evals,
                     grad_evals,
+                    pareto_front: Vec::new(),
                 });
             }
 
@@ -216,6 +219,7 @@ impl Solver for NewtonOptimizer {
             params,
             cost_evals,
             grad_evals,
+            pareto_front: Vec::new(),
         })
     }
 }
@@ -0,0 +1,237 @@
+//! Pareto dominance utilities for multi-objective solvers
+//!
+//! Objective vectors are stored row-major in flat buffers (`m` values per
+//! row), matching the swarm layout used by the PSO solver. All objectives
+//! are minimized.
+
+/// True if `a` is no worse than `b` in every objective and strictly better in one
+#[inline]
+pub fn dominates(a: &[f64], b: &[f64]) -> bool {
+    let mut strictly_better = false;
+    for (&x, &y) in a.iter().zip(b) {
+        if x > y {
+            return false;
+        }
+        strictly_better |= x < y;
+    }
+    strictly_better
+}
+
+/// Crowding distance of each row of a row-major objective matrix (NSGA-II)
+///
+/// Sum over objectives of the normalized gap between a row's two neighbours
+/// along that objective; rows at either end of any objective get infinity.
+pub fn crowding_distances(objectives: &[f64], m: usize) -> Vec<f64> {
+    let len = objectives.len() / m;
+    if len <= 2 {
+        return vec![f64::INFINITY; len];
+    }
+
+    let mut distances = vec![0.0; len];
+    let mut order: Vec<usize> = (0..len).collect();
+    for k in 0..m {
+        let value = |i: usize| objectives[i * m + k];
+        order.sort_unstable_by(|&a, &b| value(a).total_cmp(&value(b)));
+
+        distances[order[0]] = f64::INFINITY;
+        distances[order[len - 1]] = f64::INFINITY;
+        let range = value(order[len - 1]) - value(order[0]);
+        if range > 0.0 {
+            for w in order.windows(3) {
+                distances[w[1]] += (value(w[2]) - value(w[0])) / range;
+            }
+        }
+    }
+
+    distances
+}
+
+/// External archive of non-dominated solutions found so far
+///
+/// Holds at most `capacity` solutions; once full, the most crowded member is
+/// dropped (MOPSO-CD), so the archive keeps an even spread along the front.
+pub struct ParetoArchive {
+    n_params: usize,
+    n_objectives: usize,
+    capacity: usize,
+    positions: Vec<f64>,
+    objectives: Vec<f64>,
+}
+
+impl ParetoArchive {
+    pub fn new(n_params: usize, n_objectives: usize, capacity: usize) -> Self {
+        Self {
+            n_params,
+            n_objectives,
+            capacity: capacity.max(1),
+            positions: Vec::new(),
+            objectives: Vec::new(),
+        }
+    }
+
+    fn len(&self) -> usize {
+        self.objectives.len() / self.n_objectives
+    }
+
+    /// Merge candidate rows into the archive, keeping only non-dominated,
+    /// distinct objective vectors
+    ///
+    /// Candidates are inserted one at a time against the current archive, so an
+    /// update costs O(candidates x archive) dominance checks rather than a full
+    /// sweep over the merged set.
+    pub fn update(&mut self, positions: &[f64], objectives: &[f64]) {
+        for (x, f) in positions
+            .chunks_exact(self.n_params)
+            .zip(objectives.chunks_exact(self.n_objectives))
+        {
+            self.insert(x, f);
+        }
+    }
+
+    /// Add one solution unless an archived one dominates or equals it, evicting
+    /// the archived solutions it dominates (and the most crowded one if the
+    /// archive overflows); returns whether the solution was kept
+    pub fn insert(&mut self, position: &[f64], objective: &[f64]) -> bool {
+        let (n, m) = (self.n_params, self.n_objectives);
+        if self
+            .objectives
+            .chunks_exact(m)
+            .any(|kept| kept == objective || dominates(kept, objective))
+        {
+            return false;
+        }
+
+        // Compact in place, dropping members the new solution dominates
+        let mut kept = 0;
+        for i in 0..self.len() {
+            if !dominates(objective, &self.objectives[i * m..(i + 1) * m]) {
+                if kept != i {
+                    self.objectives.copy_within(i * m..(i + 1) * m, kept * m);
+                    self.positions.copy_within(i * n..(i + 1) * n, kept * n);
+                }
+                kept += 1;
+            }
+        }
+        self.objectives.truncate(kept * m);
+        self.positions.truncate(kept * n);
+
+        self.objectives.extend_from_slice(objective);
+        self.positions.extend_from_slice(position);
+
+        if kept < self.capacity {
+            return true;
+        }
+        // Over capacity: replace the most crowded member with the last one
+        let distances = crowding_distances(&self.objectives, m);
+        let crowded = (0..distances.len())
+            .min_by(|&a, &b| distances[a].total_cmp(&distances[b]))
+            .unwrap_or(kept);
+        if crowded != kept {
+            self.objectives
+                .copy_within(kept * m..(kept + 1) * m, crowded * m);
+            self.positions
+                .copy_within(kept * n..(kept + 1) * n, crowded * n);
+        }
+        self.objectives.truncate(kept * m);
+        self.positions.truncate(kept * n);
+        crowded != kept
+    }
+
+    /// Parameter sets of the archived solutions
+    pub fn positions(&self) -> impl Iterator<Item = &[f64]> {
+        self.positions.chunks_exact(self.n_params)
+    }
+
+    /// Parameter set of the `i`-th archived solution
+    pub fn position(&self, i: usize) -> &[f64] {
+        &self.positions[i * self.n_params..(i + 1) * self.n_params]
+    }
+
+    /// Indices of the least crowded `fraction` of the archive (at least one
+    /// when non-empty), most isolated first
+    pub fn leaders(&self, fraction: f64) -> Vec<usize> {
+        let distances = crowding_distances(&self.objectives, self.n_objectives);
+        let mut order: Vec<usize> = (0..distances.len()).collect();
+        order.sort_unstable_by(|&a, &b| distances[b].total_cmp(&distances[a]));
+        order.truncate(((distances.len() as f64 * fraction).ceil() as usize).max(1));
+        order
+    }
+
+    /// Owned copies of the archived parameter sets
+    pub fn front(&self) -> Vec<Vec<f64>> {
+        self.positions().map(<[f64]>::to_vec).collect()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Archive of points on the front f2 = 1 / f1, tagged by their index
+    fn front(capacity: usize, count: usize) -> ParetoArchive {
+        let mut archive = ParetoArchive::new(1, 2, capacity);
+        for i in 0..count {
+            let f1 = 1.0 + i as f64;
+            archive.insert(&[i as f64], &[f1, 1.0 / f1]);
+        }
+        archive
+    }
+
+    #[test]
+    fn archive_keeps_a_mutually_nondominated_front() {
+        let mut archive = ParetoArchive::new(1, 2, 10);
+        archive.update(
+            &[0.0, 1.0, 2.0, 3.0, 4.0],
+            &[3.0, 3.0, 1.0, 4.0, 4.0, 1.0, 2.0, 2.0, 5.0, 5.0],
+        );
+
+        let kept: Vec<f64> = archive.positions().map(|x| x[0]).collect();
+        assert_eq!(kept, vec![1.0, 2.0, 3.0]);
+        for a in archive.objectives.chunks_exact(2) {
+            for b in archive.objectives.chunks_exact(2) {
+                assert!(!dominates(a, b));
+            }
+        }
+    }
+
+    #[test]
+    fn archive_respects_capacity() {
+        let archive = front(4, 10);
+        assert_eq!(archive.len(), 4);
+        assert_eq!(archive.positions.len(), 4);
+
+        // The ends of the front have infinite crowding distance and survive
+        let kept: Vec<f64> = archive.positions().map(|x| x[0]).collect();
+        assert!(kept.contains(&0.0) && kept.contains(&9.0));
+    }
+
+    #[test]
+    fn archive_rejects_duplicates_and_dominated_points() {
+        let mut archive = front(10, 3);
+        assert!(!archive.insert(&[7.0], &[2.0, 0.5]));
+        assert!(!archive.insert(&[8.0], &[2.5, 0.6]));
+        assert_eq!(archive.len(), 3);
+
+        assert!(archive.insert(&[9.0], &[0.5, 0.5]));
+        assert_eq!(archive.front(), vec![vec![2.0], vec![9.0]]);
+    }
+
+    #[test]
+    fn leaders_are_least_crowded_first() {
+        let mut archive = ParetoArchive::new(1, 2, 10);
+        archive.update(
+            &[0.0, 1.0, 2.0, 3.0],
+            &[0.0, 10.0, 1.0, 9.0, 5.0, 5.0, 10.0, 0.0],
+        );
+
+        let leaders = archive.leaders(1.0);
+        let mut ends = leaders[..2].to_vec();
+        ends.sort_unstable();
+        assert_eq!(ends, vec![0, 3]);
+        // Row 2 has wider gaps to its neighbours than row 1
+        assert_eq!(&leaders[2..], &[2, 1]);
+
+        assert_eq!(archive.leaders(0.25).len(), 1);
+        assert_eq!(archive.leaders(0.0).len(), 1);
+    }
+}
@@ -1,5 +1,23 @@
-use super::traits::{OptimizationCallback, Problem, Solver, SolverResult};
-use rand::Rng;
+use super::pareto::ParetoArchive;
+use super::traits::{CostJob, OptimizationCallback, Problem, Solver, SolverResult};
+use rand::rngs::SmallRng;
+use rand::{Rng, SeedableRng};
+
+/// Share of the archive (least crowded first) that multi-objective leaders come from
+const LEADER_FRACTION: f64 = 0.1;
+
+/// Maximum number of non-dominated solutions kept in the Pareto archive
+const ARCHIVE_CAPACITY: usize = 100;
+
+/// Consecutive iterations without global best improvement before stopping
+const MAX_STAGNATION: u32 = 5;
+
+/// Per-dimension position bounds and velocity limits, hoisted out of the update loop
+struct SearchLimits {
+    lower: Vec<f64>,
+    upper: Vec<f64>,
+    v_max: Vec<f64>,
+}
 
 /// Particle Swarm Optimization - often outperforms gradient-based methods
 /// for noisy, non-convex problems with fewer cost evaluations
@@ -10,6 +28,9 @@ pub struct ParticleOptimizer {
     inertia: f64,   // w - velocity inertia weight
     cognitive: f64, // c1 - personal best influence
     social: f64,    // c2 - global best influence
+    seed: Option<u64>,
+    /// Steer toward Pareto archive leaders instead of the global best (MOPSO-CD)
+    pareto_leaders: bool,
 }
 
 impl ParticleOptimizer {
@@ -21,6 +42,8 @@ impl ParticleOptimizer {
             inertia: 0.7,
             cognitive: 1.5,
             social: 1.5,
+            seed: None,
+            pareto_leaders: false,
         }
     }
 
@@ -38,6 +61,31 @@ impl ParticleOptimizer {
         self
     }
 
+    /// Seed the random number generator (default: seeded from OS entropy)
+    pub fn with_seed(mut self, seed: u64) -> Self {
+        self.seed = Some(seed);
+        self
+    }
+
+    /// Steer multi-objective problems toward leaders from the least crowded part
+    /// of the Pareto archive (MOPSO-CD) instead of the weighted-sum global best
+    /// (default: off). Every particle is then fully evaluated, without the
+    /// personal-best cutoff, so all trade-offs reach the archive.
+    pub fn with_pareto_leaders(mut self, enabled: bool) -> Self {
+        self.pareto_leaders = enabled;
+        self
+    }
+
+    /// Cutoff for a particle's next evaluation
+    #[inline]
+    fn cutoff(&self, personal_best_cost: f64) -> f64 {
+        if self.pareto_leaders {
+            f64::INFINITY
+        } else {
+            personal_best_cost
+        }
+    }
+
     #[inline]
     fn clamp_params(&self, params: &mut [f64], bounds: &[(f64, f64)]) {
         for (i, &(min, max)) in bounds.iter().enumerate() {
@@ -45,46 +93,221 @@ impl ParticleOptimizer {
         }
     }
 
+    /// Fused velocity and position update for one particle
+    ///
+    /// Single pass over the particle's row with no temporaries. Every slice is
+    /// re-sliced to the row length up front so the loop runs without bounds checks.
+    #[inline]
+    fn step_particle(
+        &self,
+        x: &mut [f64],
+        v: &mut [f64],
+        best: &[f64],
+        guide: &[f64],
+        limits: &SearchLimits,
+        rng: &mut impl Rng,
+    ) {
+        let n = x.len();
+        let (v, best, guide) = (&mut v[..n], &best[..n], &guide[..n]);
+        let (lower, upper, v_max) = (&limits.lower[..n], &limits.upper[..n], &limits.v_max[..n]);
+        let (w, c1, c2) = (self.inertia, self.cognitive, self.social);
+
+        for i in 0..n {
+            let r1 = rng.gen::<f64>();
+            let r2 = rng.gen::<f64>();
+
+            // PSO velocity update equation, clamped to a fraction of the search space
+            v[i] = (w * v[i] + c1 * r1 * (best[i] - x[i]) + c2 * r2 * (guide[i] - x[i]))
+                .clamp(-v_max[i], v_max[i]);
+
+            // Update position and clamp to bounds
+            x[i] = (x[i] + v[i]).clamp(lower[i], upper[i]);
+        }
+    }
+
+    /// Bounds and velocity limits for the problem's parameters
+    fn search_limits(&self, problem: &dyn Problem) -> SearchLimits {
+        let bounds = problem.bounds();
+        let lower: Vec<f64> = bounds.iter().map(|&(min, _)| min).collect();
+        let upper: Vec<f64> = bounds.iter().map(|&(_, max)| max).collect();
+        let mut v_max: Vec<f64> = bounds.iter().map(|&(min, max)| (max - min) * 0.2).collect();
+        // Parameters set by constraint projection are not searched: a zero velocity
+        // limit keeps the swarm from perturbing them
+        for &i in problem.dependent_params() {
+            v_max[i] = 0.0;
+        }
+
+        SearchLimits {
+            lower,
+            upper,
+            v_max,
+        }
+    }
+
+    /// Asynchronous PSO for problems that evaluate several particles concurrently
+    ///
+    /// Rather than waiting for the whole swarm each iteration, every particle is
+    /// moved and resubmitted as soon as its own evaluation completes, steered by
+    /// the best positions known at that moment, so one slow simulation never
+    /// stalls the workers. Every `population_size` completed evaluations count as
+    /// one iteration for progress reporting and the stopping rules.
+    fn solve_async(
+        &self,
+        problem: &dyn Problem,
+        callback: &mut dyn OptimizationCallback,
+        rng: &mut SmallRng,
+    ) -> Result<SolverResult, String> {
+        let n = problem.num_params();
+        let bounds = problem.bounds();
+        let limits = self.search_limits(problem);
+
+        let mut positions = self.initialize_positions(n, bounds, problem.initial_params(), rng);
+        let mut velocities = self.initialize_velocities(n, bounds, rng);
+        let mut personal_best_positions = positions.clone();
+        let mut personal_best_costs = vec![f64::INFINITY; self.population_size];
+
+        let mut global_best_position = positions[..n].to_vec();
+        let mut global_best_cost = f64::INFINITY;
+
+        let m = problem.num_objectives();
+        let mut archive = ParetoArchive::new(n, m, ARCHIVE_CAPACITY);
+        let mut leaders: Vec<usize> = Vec::new();
+
+        let mut cost_evals = 0;
+        let mut iterations = 0;
+        let mut stagnation_counter = 0;
+        let mut prev_global_best = f64::INFINITY;
+        // Set once a stopping rule fires; evaluations still running are then drained
+        let mut outcome: Option<(bool, &str)> = None;
+
+        let mut jobs: Vec<CostJob> = Vec::with_capacity(self.population_size);
+        for (p, particle) in positions.chunks_exact_mut(n).enumerate() {
+            problem.apply_constraints(particle)?;
+            self.clamp_params(particle, bounds);
+            jobs.push((p, particle.to_vec(), f64::INFINITY));
+        }
+
+        problem.cost_as_completed(jobs, &mut |p, cost| {
+            cost_evals += 1;
+            let x = &mut positions[p * n..(p + 1) * n];
+
+            if cost < personal_best_costs[p] {
+                personal_best_costs[p] = cost;
+                personal_best_positions[p * n..(p + 1) * n].copy_from_slice(x);
+            }
+            if cost < global_best_cost {
+                global_best_cost = cost;
+                global_best_position.copy_from_slice(x);
+            }
+            // Every fully evaluated particle is a Pareto candidate; an early-stopped
+            // one has only a partial cost above its personal best, which the
+            // single-objective archive rejects anyway
+            if m > 1 {
+                let inserted = match problem.evaluated_objectives(x)? {
+                    Some(objectives) => archive.insert(x, &objectives),
+                    None => false,
+                };
+                if inserted && self.pareto_leaders {
+                    leaders = archive.leaders(LEADER_FRACTION);
+                }
+            } else {
+                archive.insert(x, &[cost]);
+            }
+
+            if outcome.is_none() && cost_evals % self.population_size == 0 {
+                iterations += 1;
+                callback.on_iteration(iterations, &global_best_position, global_best_cost)?;
+
+                if callback.should_stop() {
+                    outcome = Some((true, "Stopped by callback"));
+                } else if global_best_cost < self.precision {
+                    outcome = Some((true, "Converged"));
+                } else if (prev_global_best - global_best_cost).abs() < self.precision * 0.01 {
+                    stagnation_counter += 1;
+                    if stagnation_counter >= MAX_STAGNATION {
+                        outcome = Some((false, "Stagnated"));
+                    }
+                } else {
+                    stagnation_counter = 0;
+                }
+                if outcome.is_none() && iterations >= self.max_iter {
+                    outcome = Some((false, "Max iterations reached"));
+                }
+                prev_global_best = global_best_cost;
+            }
+            if outcome.is_some() {
+                return Ok(None);
+            }
+
+            // Move this particle using the current bests and send it straight back
+            let guide = if leaders.is_empty() {
+                &global_best_position[..]
+            } else {
+                archive.position(leaders[rng.gen_range(0..leaders.len())])
+            };
+            let v = &mut velocities[p * n..(p + 1) * n];
+            let best = &personal_best_positions[p * n..(p + 1) * n];
+            self.step_particle(x, v, best, guide, &limits, rng);
+            problem.apply_constraints(x)?;
+            self.clamp_params(x, bounds);
+
+            Ok(Some((p, x.to_vec(), self.cutoff(personal_best_costs[p]))))
+        })?;
+
+        let (success, message) = outcome.unwrap_or((false, "Max iterations reached"));
+        Ok(SolverResult {
+            success,
+            cost: global_best_cost,
+            iterations,
+            message: message.into(),
+            params: global_best_position,
+            cost_evals,
+            grad_evals: 0,
+            pareto_front: archive.front(),
+        })
+    }
+
     /// Initialize particle positions uniformly within bounds
-    fn initialize_particles(
+    ///
+    /// Positions are stored row-major in a single contiguous buffer of
+    /// `population_size * n_params` values, one row per particle.
+    fn initialize_positions(
         &self,
         n_params: usize,
         bounds: &[(f64, f64)],
         initial_params: &[f64],
-    ) -> Vec<Vec<f64>> {
-        let mut rng = rand::thread_rng();
-        let mut particles = Vec::with_capacity(self.population_size);
+        rng: &mut impl Rng,
+    ) -> Vec<f64> {
+        let mut positions = vec![0.0; self.population_size * n_params];
 
         // First particle is the provided initial guess
-        particles.push(initial_params.to_vec());
+        positions[..n_params].copy_from_slice(initial_params);
 
         // Rest are random within bounds
-        for _ in 1..self.population_size {
-            let mut particle = vec![0.0; n_params];
-            for i in 0..n_params {
-                let (min, max) = bounds[i];
-                particle[i] = rng.gen_range(min..=max);
+        for particle in positions.chunks_exact_mut(n_params).skip(1) {
+            for (x, &(min, max)) in particle.iter_mut().zip(bounds) {
+                *x = rng.gen_range(min..=max);
             }
-            particles.push(particle);
         }
 
-        particles
+        positions
     }
 
-    /// Initialize velocities (small random values)
-    fn initialize_velocities(&self, n_params: usize, bounds: &[(f64, f64)]) -> Vec<Vec<f64>> {
-        let mut rng = rand::thread_rng();
-        let mut velocities = Vec::with_capacity(self.population_size);
+    /// Initialize velocities (small random values), same layout as positions
+    fn initialize_velocities(
+        &self,
+        n_params: usize,
+        bounds: &[(f64, f64)],
+        rng: &mut impl Rng,
+    ) -> Vec<f64> {
+        let mut velocities = vec![0.0; self.population_size * n_params];
 
-        for _ in 0..self.population_size {
-            let mut velocity = vec![0.0; n_params];
-            for i in 0..n_params {
-                let (min, max) = bounds[i];
+        for velocity in velocities.chunks_exact_mut(n_params) {
+            for (v, &(min, max)) in velocity.iter_mut().zip(bounds) {
                 let range = max - min;
                 // Initialize velocity to small fraction of parameter range
-                velocity[i] = rng.gen_range(-range * 0.1..=range * 0.1);
+                *v = rng.gen_range(-range * 0.1..=range * 0.1);
             }
-            velocities.push(velocity);
         }
 
         velocities
@@ -93,7 +316,19 @@ impl ParticleOptimizer {
 
 impl Solver for ParticleOptimizer {
     fn name(&self) -> &str {
-        "PSO"
+        if self.pareto_leaders {
+            "MOPSO-CD"
+        } else {
+            "PSO"
+        }
+    }
+
+    fn set_seed(&mut self, seed: u64) {
+        self.seed = Some(seed);
+    }
+
+    fn evaluates_in_parallel(&self) -> bool {
+        true
     }
 
     fn solve(
@@ -103,50 +338,95 @@ impl Solver for ParticleOptimizer {
     ) -> Result<SolverResult, String> {
         let n = problem.num_params();
         let bounds = problem.bounds();
-        let mut rng = rand::thread_rng();
+        // Small, fast generator: two uniforms per dimension per particle each iteration
+        let mut rng = match self.seed {
+            Some(seed) => SmallRng::seed_from_u64(seed),
+            None => SmallRng::from_entropy(),
+        };
+
+        // Overlap evaluations with the swarm update when simulations run in parallel
+        if problem.concurrency() > 1 && self.max_iter > 0 {
+            return self.solve_async(problem, callback, &mut rng);
+        }
+
+        let limits = self.search_limits(problem);
 
-        // Initialize swarm
-        let mut particles = self.initialize_particles(n, bounds, problem.initial_params());
-        let mut velocities = self.initialize_velocities(n, bounds);
-        let mut personal_best_positions = particles.clone();
+        // Initialize swarm (flat row-major buffers: particle p occupies [p * n, (p + 1) * n)).
+        // State stays f64: the buffers are only a few KB and every iteration is
+        // dominated by ngspice, so f32 would save nothing measurable.
+        let mut positions =
+            self.initialize_positions(n, bounds, problem.initial_params(), &mut rng);
+        let mut velocities = self.initialize_velocities(n, bounds, &mut rng);
+        let mut personal_best_positions = positions.clone();
         let mut personal_best_costs = vec![f64::INFINITY; self.population_size];
 
-        let mut global_best_idx = 0;
+        let mut global_best_position = positions[..n].to_vec();
         let mut global_best_cost = f64::INFINITY;
 
+        // Non-dominated solutions across all evaluations (per-target trade-offs)
+        let m = problem.num_objectives();
+        let mut archive = ParetoArchive::new(n, m, ARCHIVE_CAPACITY);
+
         let mut cost_evals = 0;
         let mut stagnation_counter = 0;
-        const MAX_STAGNATION: u32 = 5;
 
         // Main optimization loop
         for iter in 0..self.max_iter {
             let prev_global_best = global_best_cost;
 
-            // Evaluate all particles
-            for p in 0..self.population_size {
-                // Apply constraints and bounds
-                problem.apply_constraints(&mut particles[p])?;
-                self.clamp_params(&mut particles[p], bounds);
-
-                // Evaluate cost (THIS RUNS SIMULATION)
-                let cost = problem.cost(&particles[p])?;
-                cost_evals += 1;
+            // Apply constraints and bounds to every particle
+            for particle in positions.chunks_exact_mut(n) {
+                problem.apply_constraints(particle)?;
+                self.clamp_params(particle, bounds);
+            }
 
-                // Update personal best
+            // Evaluate the whole swarm (THIS RUNS SIMULATIONS, possibly in parallel).
+            // A particle that cannot beat its personal best may stop early, since
+            // only improvements update the personal and global bests.
+            let cutoffs: Vec<f64> = personal_best_costs
+                .iter()
+                .map(|&c| self.cutoff(c))
+                .collect();
+            let costs = problem.cost_batch(&positions, &cutoffs)?;
+            cost_evals += self.population_size;
+
+            // Update personal bests
+            for (p, &cost) in costs.iter().enumerate() {
                 if cost < personal_best_costs[p] {
                     personal_best_costs[p] = cost;
-                    personal_best_positions[p].copy_from_slice(&particles[p]);
+                    personal_best_positions[p * n..(p + 1) * n]
+                        .copy_from_slice(&positions[p * n..(p + 1) * n]);
                 }
+            }
 
-                // Update global best
+            // Update global best from the best particle of this iteration
+            if let Some((p, &cost)) = costs.iter().enumerate().min_by(|a, b| a.1.total_cmp(b.1)) {
                 if cost < global_best_cost {
                     global_best_cost = cost;
-                    global_best_idx = p;
+                    global_best_position.copy_from_slice(&positions[p * n..(p + 1) * n]);
                 }
             }
 
+            // Update the Pareto archive from every fully evaluated particle. Early-stopped
+            // particles only carry a partial cost, above their personal best, so
+            // single-objective problems can pass every cost and let the archive reject them.
+            let mut candidates = Vec::with_capacity(self.population_size * n);
+            let mut objectives = Vec::with_capacity(self.population_size * m);
+            for (p, particle) in positions.chunks_exact(n).enumerate() {
+                if m > 1 {
+                    if let Some(f) = problem.evaluated_objectives(particle)? {
+                        candidates.extend_from_slice(particle);
+                        objectives.extend(f);
+                    }
+                } else {
+                    candidates.extend_from_slice(particle);
+                    objectives.push(costs[p]);
+                }
+            }
+            archive.update(&candidates, &objectives);
+
             // Report progress using the global best
-            callback.on_iteration(iter + 1, &personal_best_positions[global_best_idx], global_best_cost)?;
+            callback.on_iteration(iter + 1, &global_best_position, global_best_cost)?;
 
             // Check for early termination
             if callback.should_stop() {
@@ -155,9 +435,10 @@ impl Solver for ParticleOptimizer {
                     cost: global_best_cost,
                     iterations: iter + 1,
                     message: "Stopped by callback".into(),
-                    params: personal_best_positions[global_best_idx].clone(),
+                    params: global_best_position,
                     cost_evals,
                     grad_evals: 0,
+                    pareto_front: archive.front(),
                 });
             }
 
@@ -168,9 +449,10 @@ impl Solver for ParticleOptimizer {
                     cost: global_best_cost,
                     iterations: iter + 1,
                     message: "Converged".into(),
-                    params: personal_best_positions[global_best_idx].clone(),
+                    params: global_best_position,
                     cost_evals,
                     grad_evals: 0,
+                    pareto_front: archive.front(),
                 });
             }
 
@@ -183,37 +465,37 @@ impl Solver for ParticleOptimizer {
                         cost: global_best_cost,
                         iterations: iter + 1,
                         message: "Stagnated".into(),
-                        params: personal_best_positions[global_best_idx].clone(),
+                        params: global_best_position,
                         cost_evals,
                         grad_evals: 0,
+                        pareto_front: archive.front(),
                     });
                 }
             } else {
                 stagnation_counter = 0;
             }
 
-            // Update velocities and positions for all particles
-            for p in 0..self.population_size {
-                for i in 0..n {
-                    let r1 = rng.gen::<f64>();
-                    let r2 = rng.gen::<f64>();
-
-                    // PSO velocity update equation
-                    velocities[p][i] = self.inertia * velocities[p][i]
-                        + self.cognitive * r1 * (personal_best_positions[p][i] - particles[p][i])
-                        + self.social * r2 * (personal_best_positions[global_best_idx][i] - particles[p][i]);
-
-                    // Clamp velocity to fraction of search space
-                    let (min, max) = bounds[i];
-                    let v_max = (max - min) * 0.2;
-                    velocities[p][i] = velocities[p][i].clamp(-v_max, v_max);
-
-                    // Update position
-                    particles[p][i] += velocities[p][i];
-                }
-
-                // Clamp to bounds
-                self.clamp_params(&mut particles[p], bounds);
+            // With Pareto leaders, multi-objective problems steer each particle toward a
+            // leader drawn from the sparsest part of the archive (MOPSO-CD), spreading
+            // the swarm along the front instead of collapsing onto the weighted-sum optimum
+            let leaders = if self.pareto_leaders && m > 1 {
+                archive.leaders(LEADER_FRACTION)
+            } else {
+                Vec::new()
+            };
+
+            // Update velocities and positions for the whole swarm in one pass
+            for ((x, v), best) in positions
+                .chunks_exact_mut(n)
+                .zip(velocities.chunks_exact_mut(n))
+                .zip(personal_best_positions.chunks_exact(n))
+            {
+                let guide = if leaders.is_empty() {
+                    &global_best_position[..]
+                } else {
+                    archive.position(leaders[rng.gen_range(0..leaders.len())])
+                };
+                self.step_particle(x, v, best, guide, &limits, &mut rng);
             }
         }
 
@@ -223,9 +505,10 @@ impl Solver for ParticleOptimizer {
             cost: global_best_cost,
             iterations: self.max_iter,
             message: "Max iterations reached".into(),
-            params: personal_best_positions[global_best_idx].clone(),
+            params: global_best_position,
             cost_evals,
             grad_evals: 0,
+            pareto_front: archive.front(),
         })
     }
 }
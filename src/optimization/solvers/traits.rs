@@ -1,3 +1,9 @@
+use std::collections::VecDeque;
+
+/// A parameter set queued with `Problem::cost_as_completed`: a caller-chosen id,
+/// the parameter values and the cutoff the evaluation may stop at
+pub type CostJob = (usize, Vec<f64>, f64);
+
 #[derive(Clone, Debug)]
 pub struct SolverResult {
     pub success: bool,
@@ -7,6 +13,8 @@ pub struct SolverResult {
     pub params: Vec<f64>,
     pub cost_evals: usize,
     pub grad_evals: usize,
+    /// Non-dominated parameter sets (multi-objective solvers only)
+    pub pareto_front: Vec<Vec<f64>>,
 }
 
 /// Callback interface for optimization progress
@@ -25,6 +33,75 @@ pub trait Problem {
     /// Evaluate cost for given parameters (runs simulation)
     fn cost(&self, params: &[f64]) -> Result<f64, String>;
 
+    /// Evaluate cost, allowing the evaluation to stop once it exceeds `cutoff`
+    ///
+    /// An early-stopped evaluation returns a partial cost that is already
+    /// greater than `cutoff` (a lower bound on the true cost). Defaults to the
+    /// full `cost`.
+    fn cost_bounded(&self, params: &[f64], _cutoff: f64) -> Result<f64, String> {
+        self.cost(params)
+    }
+
+    /// Evaluate cost for a batch of parameter sets stored row-major
+    /// (`num_params()` values per row), returning one cost per row
+    ///
+    /// Each row may stop early once it exceeds its entry in `cutoffs` (see
+    /// `cost_bounded`); pass `f64::INFINITY` to force a full evaluation.
+    /// Defaults to calling `cost_bounded` on each row in turn; concurrent
+    /// evaluation goes through `cost_as_completed` instead.
+    fn cost_batch(&self, rows: &[f64], cutoffs: &[f64]) -> Result<Vec<f64>, String> {
+        rows.chunks_exact(self.num_params())
+            .zip(cutoffs.iter())
+            .map(|(row, &cutoff)| self.cost_bounded(row, cutoff))
+            .collect()
+    }
+
+    /// Number of evaluations that can run at the same time (1 = serial)
+    fn concurrency(&self) -> usize {
+        1
+    }
+
+    /// Evaluate parameter sets as they are queued, reporting each cost as it completes
+    ///
+    /// `on_done(id, cost)` is called in completion order and may queue a follow-up
+    /// job, so a solver can resubmit one candidate without waiting for the rest.
+    /// Cutoffs behave as in `cost_bounded`. Defaults to evaluating the queue in
+    /// order with `cost_bounded`; problems that run several simulations
+    /// concurrently override this along with `concurrency`.
+    fn cost_as_completed(
+        &self,
+        jobs: Vec<CostJob>,
+        on_done: &mut dyn FnMut(usize, f64) -> Result<Option<CostJob>, String>,
+    ) -> Result<(), String> {
+        let mut queue: VecDeque<CostJob> = jobs.into();
+        while let Some((id, params, cutoff)) = queue.pop_front() {
+            let cost = self.cost_bounded(&params, cutoff)?;
+            queue.extend(on_done(id, cost)?);
+        }
+        Ok(())
+    }
+
+    /// Number of objectives reported by `objectives` (1 for purely scalar problems)
+    fn num_objectives(&self) -> usize {
+        1
+    }
+
+    /// Per-objective costs for given parameters, all minimized
+    ///
+    /// Defaults to the scalar cost; multi-objective problems return one value
+    /// per objective so solvers can track Pareto dominance.
+    fn objectives(&self, params: &[f64]) -> Result<Vec<f64>, String> {
+        Ok(vec![self.cost(params)?])
+    }
+
+    /// Per-objective costs if `params` was fully evaluated, `None` if its last
+    /// evaluation stopped early at a cutoff (only a partial cost is known)
+    ///
+    /// Defaults to `objectives`, for problems that never stop early.
+    fn evaluated_objectives(&self, params: &[f64]) -> Result<Option<Vec<f64>>, String> {
+        self.objectives(params).map(Some)
+    }
+
     /// Number of parameters
     fn num_params(&self) -> usize;
 
@@ -36,6 +113,12 @@ pub trait Problem {
 
     /// Apply constraints to parameters (modifies params in place)
     fn apply_constraints(&self, params: &mut [f64]) -> Result<(), String>;
+
+    /// Indices of parameters fully determined by `apply_constraints` (e.g. equality
+    /// constraints), which solvers need not search over
+    fn dependent_params(&self) -> &[usize] {
+        &[]
+    }
 }
 
 /// Solver interface - takes problem and callback
@@ -48,6 +131,16 @@ pub trait Solver {
         problem: &dyn Problem,
         callback: &mut dyn OptimizationCallback,
     ) -> Result<SolverResult, String>;
+
+    /// Seed the solver's random number generator for reproducible runs
+    /// (deterministic solvers ignore this)
+    fn set_seed(&mut self, _seed: u64) {}
+
+    /// Whether the solver evaluates several candidates at once through
+    /// `Problem::cost_as_completed`, so parallel ngspice workers pay off
+    fn evaluates_in_parallel(&self) -> bool {
+        false
+    }
 }
 
 // ============================================================================
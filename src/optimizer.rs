@@ -27,12 +27,20 @@ pub struct Optimizer {
     pub precision: f64,
     #[pyo3(get, set)]
     pub verbose: bool,
+    /// Number of ngspice processes used to evaluate a swarm in parallel (1 = serial)
+    #[pyo3(get, set)]
+    pub n_workers: usize,
+    /// Random seed for stochastic solvers (None = nondeterministic); only
+    /// reproducible with `n_workers == 1`, since parallel PSO updates particles
+    /// in simulation completion order
+    #[pyo3(get, set)]
+    pub seed: Option<u64>,
 }
 
 #[pymethods]
 impl Optimizer {
     #[new]
-    #[pyo3(signature = (circuit="".to_string(), template=".".to_string(), solver="auto".to_string(), max_iterations=1000, precision=1e-6, verbose=false))]
+    #[pyo3(signature = (circuit="".to_string(), template=".".to_string(), solver="auto".to_string(), max_iterations=1000, precision=1e-6, verbose=false, n_workers=1, seed=None))]
     fn new(
         circuit: String,
         template: String,
@@ -40,15 +48,21 @@ impl Optimizer {
         max_iterations: u32,
         precision: f64,
         verbose: bool,
-    ) -> Self {
-        Self {
+        n_workers: usize,
+        seed: Option<u64>,
+    ) -> PyResult<Self> {
+        validate_solver_name(&solver).map_err(PyValueError::new_err)?;
+
+        Ok(Self {
             circuit,
             template,
             solver,
             max_iterations,
             precision,
             verbose,
-        }
+            n_workers,
+            seed,
+        })
     }
 
     fn optimize(
@@ -148,6 +162,51 @@ impl Optimizer {
             println!("✓ NgSpice initialized");
         }
 
+        // `solver` is settable from Python, so re-check it before resolving
+        validate_solver_name(&self.solver).map_err(PyValueError::new_err)?;
+        let mut solver: Box<dyn Solver> = match solver_factory(&self.solver) {
+            Some(factory) => factory(self.max_iterations, self.precision),
+            None => {
+                // Prepare inputs for select_solver
+                let num_params = params_native.len();
+                let bounds: Vec<(f64, f64)> = params_native
+                    .iter()
+                    .map(|p| (p.min_val, p.max_val))
+                    .collect();
+
+                let (solver, _solver_name) = select_solver(
+                    num_params,
+                    &bounds,
+                    has_constraints,
+                    self.max_iterations,
+                    self.precision,
+                );
+                solver
+            }
+        };
+
+        if let Some(seed) = self.seed {
+            solver.set_seed(seed);
+        }
+
+        if self.verbose {
+            println!("Solver: {}", solver.name());
+        }
+
+        // Only start the ngspice worker pool when the solver can keep it busy
+        let n_workers = if solver.evaluates_in_parallel() {
+            self.n_workers
+        } else {
+            if self.n_workers > 1 {
+                eprintln!(
+                    "Warning: n_workers={} ignored: {} evaluates one candidate at a time",
+                    self.n_workers,
+                    solver.name()
+                );
+            }
+            1
+        };
+
         let start = if ENABLE_BENCHMARKS {
             Some(std::time::Instant::now())
         } else {
@@ -163,6 +222,7 @@ impl Optimizer {
             netlist_lines,
             self.verbose,
         )
+        .and_then(|problem| problem.with_workers(n_workers))
         .map_err(|e| PyValueError::new_err(e))?;
 
         if let Some(start_time) = start {
@@ -199,33 +259,6 @@ impl Optimizer {
             &problem,
         );
 
-        let mut solver: Box<dyn Solver> = match self.solver.as_str() {
-            "newton" => Box::new(NewtonOptimizer::new(self.max_iterations, self.precision)),
-            "cmaes" => Box::new(CMAESOptimizer::new(self.max_iterations, self.precision)),
-            "pso" => Box::new(ParticleOptimizer::new(self.max_iterations, self.precision)),
-            _ => {
-                // Prepare inputs for select_solver
-                let num_params = params_native.len();
-                let bounds: Vec<(f64, f64)> = params_native
-                    .iter()
-                    .map(|p| (p.min_val, p.max_val))
-                    .collect();
-
-                let (solver, _solver_name) = select_solver(
-                    num_params,
-                    &bounds,
-                    has_constraints,
-                    self.max_iterations,
-                    self.precision,
-                );
-                solver
-            }
-        };
-
-        if self.verbose {
-            println!("Solver: {}", solver.name());
-        }
-
         let start = if ENABLE_BENCHMARKS {
             Some(std::time::Instant::now())
         } else {
@@ -251,18 +284,27 @@ impl Optimizer {
             println!("Iterations: {}", result.iterations);
             println!("Cost evals: {}", result.cost_evals);
             println!("Grad evals: {}", result.grad_evals);
+            println!("Pareto front: {} designs", result.pareto_front.len());
         }
 
         // Convert result back to Python
-        let final_params: Vec<Parameter> = params_native
+        let to_parameters = |values: &[f64]| -> Vec<Parameter> {
+            params_native
+                .iter()
+                .zip(values.iter())
+                .map(|(def, &value)| Parameter {
+                    name: def.name.clone(),
+                    value,
+                    min_val: def.min_val,
+                    max_val: def.max_val,
+                })
+                .collect()
+        };
+        let final_params = to_parameters(&result.params);
+        let pareto_front = result
+            .pareto_front
             .iter()
-            .zip(result.params.iter())
-            .map(|(def, &value)| Parameter {
-                name: def.name.clone(),
-                value,
-                min_val: def.min_val,
-                max_val: def.max_val,
-            })
+            .map(|values| to_parameters(values))
             .collect();
 
         Py::new(
@@ -272,7 +314,9 @@ impl Optimizer {
                 cost: result.cost,
                 iterations: result.iterations,
                 message: result.message,
+                parameters_by_group: group_parameters(&final_params),
                 parameters: final_params,
+                pareto_front,
             },
         )
     }
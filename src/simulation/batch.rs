@@ -0,0 +1,240 @@
+use std::collections::VecDeque;
+use std::io::{BufRead, BufReader, Write};
+use std::path::{Path, PathBuf};
+use std::process::{Child, ChildStdin, ChildStdout, Command, Stdio};
+use std::sync::{mpsc, Mutex};
+
+/// Text echoed after every script so the reader knows where its output ends
+const SENTINEL: &str = "__UWASIC_SCRIPT_DONE__";
+
+/// A long-lived `ngspice -p` process with the circuit already sourced
+struct Worker {
+    child: Child,
+    stdin: ChildStdin,
+    stdout: BufReader<ChildStdout>,
+    /// Set once the process has exited (crash or unexpected quit)
+    exited: bool,
+}
+
+impl Worker {
+    /// Start ngspice in pipe mode and load the circuit once
+    fn spawn(circuit: &Path) -> Result<Self, String> {
+        let mut worker = Self::start(circuit)?;
+        worker.wait_loaded(circuit)?;
+        Ok(worker)
+    }
+
+    /// Start ngspice in pipe mode and ask it to source the circuit, without
+    /// waiting for the load to finish
+    ///
+    /// The process inherits the caller's working directory, like the embedded
+    /// library, so relative `.include`/`.lib` paths resolve the same way.
+    fn start(circuit: &Path) -> Result<Self, String> {
+        let mut child = Command::new("ngspice")
+            .arg("-p")
+            .stdin(Stdio::piped())
+            .stdout(Stdio::piped())
+            .stderr(Stdio::null())
+            .spawn()
+            .map_err(|e| format!("Failed to execute ngspice (is it on PATH?): {}", e))?;
+
+        let stdin = child.stdin.take().ok_or("Failed to open ngspice stdin")?;
+        let stdout = child.stdout.take().ok_or("Failed to open ngspice stdout")?;
+        let mut worker = Self {
+            child,
+            stdin,
+            stdout: BufReader::new(stdout),
+            exited: false,
+        };
+
+        worker.send(&format!("source {}", circuit.display()));
+        Ok(worker)
+    }
+
+    /// Block until the `source` issued by `start` (netlist and PDK models) completes
+    fn wait_loaded(&mut self, circuit: &Path) -> Result<(), String> {
+        self.receive()?;
+        if self.exited {
+            return Err(format!(
+                "ngspice exited while sourcing {}",
+                circuit.display()
+            ));
+        }
+        Ok(())
+    }
+
+    /// Send control commands and return their output, up to the sentinel
+    ///
+    /// If the process dies before or during the script, returns whatever it
+    /// printed and marks the worker as exited.
+    fn run(&mut self, script: &str) -> Result<String, String> {
+        self.send(script);
+        self.receive()
+    }
+
+    /// Write a script followed by the sentinel echo
+    fn send(&mut self, script: &str) {
+        let sent = writeln!(self.stdin, "{}\necho {}", script.trim_end(), SENTINEL)
+            .and_then(|_| self.stdin.flush());
+        if sent.is_err() {
+            // Broken pipe: the process is gone
+            self.exited = true;
+        }
+    }
+
+    /// Collect output up to the sentinel (or until the process exits)
+    fn receive(&mut self) -> Result<String, String> {
+        let mut output = String::new();
+        if self.exited {
+            return Ok(output);
+        }
+
+        let mut line = String::new();
+        loop {
+            line.clear();
+            let read = self
+                .stdout
+                .read_line(&mut line)
+                .map_err(|e| format!("Failed to read ngspice output: {}", e))?;
+            if read == 0 {
+                self.exited = true;
+                return Ok(output);
+            }
+            // The echoed text may follow a prompt; skip the command itself if echoed back
+            if line.trim_end().ends_with(SENTINEL) && !line.contains("echo") {
+                return Ok(output);
+            }
+            output.push_str(&line);
+        }
+    }
+}
+
+impl Drop for Worker {
+    fn drop(&mut self) {
+        let _ = writeln!(self.stdin, "quit");
+        let _ = self.child.kill();
+        let _ = self.child.wait();
+    }
+}
+
+/// Runs control scripts on a pool of persistent `ngspice -p` processes
+///
+/// The shared ngspice library holds a single circuit per process, so parallel
+/// evaluation goes through separate ngspice processes instead. Each process
+/// starts once, sources the circuit (and its PDK model includes) once, and
+/// then receives one script of `alterparam`/analysis/`meas` commands per
+/// parameter set, so start-up and model parsing are paid per worker rather
+/// than per simulation.
+pub struct NgSpiceBatch {
+    workers: Vec<Mutex<Worker>>,
+    circuit: PathBuf,
+}
+
+impl NgSpiceBatch {
+    pub fn new(workers: usize, circuit: &Path) -> Result<Self, String> {
+        let mut batch = Self {
+            workers: Vec::with_capacity(workers.max(1)),
+            circuit: circuit.to_path_buf(),
+        };
+        // Start every worker before waiting on any, so the netlist and PDK model
+        // parsing overlaps across processes instead of running back to back
+        for _ in 0..workers.max(1) {
+            batch
+                .workers
+                .push(Mutex::new(Worker::start(&batch.circuit)?));
+        }
+        for worker in &batch.workers {
+            worker.lock().unwrap().wait_loaded(&batch.circuit)?;
+        }
+
+        Ok(batch)
+    }
+
+    pub fn workers(&self) -> usize {
+        self.workers.len()
+    }
+
+    /// Run scripts as workers free up, handing each output to `on_done` as it completes
+    ///
+    /// Each script carries a caller-chosen tag. `on_done(tag, output)` runs on the
+    /// calling thread in completion order and may return another tagged script,
+    /// which goes to the worker that just finished, so slow simulations never hold
+    /// up the rest of the pool. Returns once nothing is queued or running; on error,
+    /// scripts already running are drained and the first error is returned.
+    pub fn run_as_completed(
+        &self,
+        scripts: Vec<(usize, String)>,
+        on_done: &mut dyn FnMut(usize, String) -> Result<Option<(usize, String)>, String>,
+    ) -> Result<(), String> {
+        let mut queue: VecDeque<(usize, String)> = scripts.into();
+        let (done_tx, done_rx) = mpsc::channel::<(usize, usize, Result<String, String>)>();
+
+        std::thread::scope(|scope| {
+            // One job channel per worker; finished outputs come back on a shared channel
+            let mut senders = Vec::with_capacity(self.workers.len());
+            for (slot, worker) in self.workers.iter().enumerate() {
+                let (job_tx, job_rx) = mpsc::channel::<(usize, String)>();
+                let done_tx = done_tx.clone();
+
+                scope.spawn(move || {
+                    let mut worker = worker.lock().unwrap();
+                    for (tag, script) in job_rx {
+                        let output = self.run_script(&mut worker, &script);
+                        if done_tx.send((slot, tag, output)).is_err() {
+                            break;
+                        }
+                    }
+                });
+                senders.push(job_tx);
+            }
+            drop(done_tx);
+
+            let mut running = 0;
+            for sender in &senders {
+                let Some(job) = queue.pop_front() else {
+                    break;
+                };
+                if sender.send(job).is_ok() {
+                    running += 1;
+                }
+            }
+
+            let mut result = Ok(());
+            while running > 0 {
+                let (slot, tag, output) = done_rx
+                    .recv()
+                    .map_err(|_| "NgSpice batch run did not complete".to_string())?;
+                running -= 1;
+                if result.is_err() {
+                    continue;
+                }
+
+                match output.and_then(|output| on_done(tag, output)) {
+                    Ok(next) => {
+                        queue.extend(next);
+                        if let Some(job) = queue.pop_front() {
+                            if senders[slot].send(job).is_ok() {
+                                running += 1;
+                            }
+                        }
+                    }
+                    Err(e) => result = Err(e),
+                }
+            }
+            // Dropping the senders lets the worker threads finish
+            result
+        })
+    }
+
+    /// Run one script, restarting the worker if ngspice died during it
+    ///
+    /// A crashed run keeps its partial output, so missing measurements are
+    /// penalized just like a failed simulation.
+    fn run_script(&self, worker: &mut Worker, script: &str) -> Result<String, String> {
+        let output = worker.run(script)?;
+        if worker.exited {
+            *worker = Worker::spawn(&self.circuit)?;
+        }
+        Ok(output)
+    }
+}
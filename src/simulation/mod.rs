@@ -1,5 +1,24 @@
+use std::path::{Path, PathBuf};
+
+pub mod batch;
 pub mod ngspice;
+pub mod sweep;
 pub mod xschem;
 
+pub use batch::NgSpiceBatch;
 pub use ngspice::NgSpice;
+pub use sweep::narrow_ac_sweep;
 pub use xschem::XSchemNetlist;
+
+/// Directory for short-lived simulation files
+///
+/// Prefers the `/dev/shm` tmpfs when available so decks and netlists never
+/// touch the disk, falling back to the system temp directory elsewhere.
+pub fn scratch_dir() -> PathBuf {
+    let shm = Path::new("/dev/shm");
+    if shm.is_dir() {
+        shm.to_path_buf()
+    } else {
+        std::env::temp_dir()
+    }
+}
@@ -241,7 +241,7 @@ impl NgSpice {
     /// This allows accessing them with the plot name prefix.
     ///
     /// # Example
-    /// ```rust
+    /// ```ignore
     /// let dc_gain = ngspice.get_meas_result_from_plot("ac1", "dc_gain_val")?;
     /// ```
     pub fn get_meas_result_from_plot(
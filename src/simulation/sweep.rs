@@ -0,0 +1,332 @@
+/// Safety factor kept around the measured frequencies when narrowing a sweep
+const SWEEP_MARGIN: f64 = 3.0;
+
+/// Control commands allowed alongside point measurements (their expressions are
+/// checked by `reads_only_scalars`)
+const SCALAR_COMMANDS: &[&str] = &["meas", "measure", "let", "print", "echo"];
+
+/// Functions that map scalars to scalars, so they may wrap measured values
+const SCALAR_FUNCTIONS: &[&str] = &[
+    "abs", "sqrt", "exp", "ln", "log", "log10", "sin", "cos", "tan", "atan", "floor", "ceil", "db",
+    "mag", "ph", "real", "imag",
+];
+
+/// Built-in constants usable in scalar expressions
+const SCALAR_CONSTANTS: &[&str] = &["pi", "e"];
+
+/// Measurement keywords that read a range of the sweep rather than one point
+const RANGE_KEYWORDS: &[&str] = &[
+    "when", "from", "to", "trig", "targ", "max", "min", "avg", "rms", "pp", "integ", "deriv",
+    "param",
+];
+
+/// Parse a SPICE number with an optional scale suffix (e.g. "1G", "10k", "2meg", "1e6")
+pub fn parse_spice_number(s: &str) -> Option<f64> {
+    let s = s.trim();
+    let split = s
+        .find(|c: char| c.is_ascii_alphabetic() && c != 'e' && c != 'E')
+        .unwrap_or(s.len());
+    let value: f64 = s[..split].parse().ok()?;
+
+    let suffix = s[split..].to_ascii_lowercase();
+    let scale = if suffix.starts_with("meg") {
+        1e6
+    } else if suffix.starts_with("mil") {
+        25.4e-6
+    } else {
+        match suffix.chars().next() {
+            Some('t') => 1e12,
+            Some('g') => 1e9,
+            Some('k') => 1e3,
+            Some('m') => 1e-3,
+            Some('u') => 1e-6,
+            Some('n') => 1e-9,
+            Some('p') => 1e-12,
+            Some('f') => 1e-15,
+            _ => 1.0, // No suffix, or a bare unit such as "Hz"
+        }
+    };
+
+    Some(value * scale)
+}
+
+/// True if a `let`/`print` expression only reads numbers, constants, scalar
+/// functions and names in `scalars` (no node access, indexing or unknown vectors)
+fn reads_only_scalars(expr: &str, scalars: &[String]) -> bool {
+    let chars: Vec<char> = expr.chars().collect();
+    let mut i = 0;
+    while i < chars.len() {
+        let c = chars[i];
+        if c.is_ascii_digit() || c == '.' {
+            // Number, possibly with an exponent or scale suffix (1e-6, 10k)
+            while i < chars.len() && (chars[i].is_ascii_alphanumeric() || chars[i] == '.') {
+                i += 1;
+                if matches!(chars[i - 1], 'e' | 'E') && matches!(chars.get(i), Some('+' | '-')) {
+                    i += 1;
+                }
+            }
+        } else if c.is_ascii_alphabetic() || c == '_' {
+            let start = i;
+            while i < chars.len() && (chars[i].is_ascii_alphanumeric() || chars[i] == '_') {
+                i += 1;
+            }
+            let name: String = chars[start..i].iter().collect();
+            let is_call = chars[i..].iter().find(|c| !c.is_whitespace()) == Some(&'(');
+            let known = if is_call {
+                SCALAR_FUNCTIONS.contains(&name.as_str())
+            } else {
+                SCALAR_CONSTANTS.contains(&name.as_str()) || scalars.contains(&name)
+            };
+            if !known {
+                return false;
+            }
+        } else if matches!(c, '[' | '@' | '#') {
+            return false;
+        } else {
+            i += 1;
+        }
+    }
+    true
+}
+
+/// Shrink a test's `.ac` sweep to the frequencies its measurements read
+///
+/// Only applies when every measurement is a point lookup (`meas ac ... FIND
+/// ... AT=f`) and every `let`/`print`/`echo` reads only those measurements (or
+/// scalars derived from them), never a sweep vector. The sweep is cut to
+/// `[min(f) / 3, max(f) * 3]` and snapped onto the original frequency grid, so
+/// the narrowed sweep solves a subset of the original points and each `AT=`
+/// lookup sees the same neighbours. Returns `None` when the code is left as is.
+pub fn narrow_ac_sweep(spice_code: &str) -> Option<String> {
+    let lines: Vec<&str> = spice_code.lines().collect();
+    let ac_idx = lines
+        .iter()
+        .position(|line| line.trim().to_ascii_lowercase().starts_with(".ac "))?;
+
+    // Measured frequencies; bail out on anything that needs the full sweep
+    let mut freqs = Vec::new();
+    // Scalars defined so far by `meas` and `let`
+    let mut scalars: Vec<String> = Vec::new();
+    for line in &lines {
+        let lower = line.trim().to_ascii_lowercase();
+        if lower.is_empty() || lower.starts_with('*') || lower.starts_with('.') || lower == "run" {
+            continue;
+        }
+
+        let words: Vec<&str> = lower.split_whitespace().collect();
+        if !SCALAR_COMMANDS.contains(&words[0]) {
+            return None;
+        }
+        if words[0].starts_with("meas") {
+            let is_point = words.get(1) == Some(&"ac")
+                && words.contains(&"find")
+                && !words.iter().any(|w| RANGE_KEYWORDS.contains(w));
+            if !is_point {
+                return None;
+            }
+            let at = words.iter().find_map(|w| w.strip_prefix("at="))?;
+            freqs.push(parse_spice_number(at)?);
+            scalars.push(words.get(2)?.to_string());
+        } else if words[0] == "let" {
+            let (name, expr) = lower["let".len()..].split_once('=')?;
+            if !reads_only_scalars(expr, &scalars) {
+                return None;
+            }
+            scalars.push(name.trim().to_string());
+        } else if words[0] == "print" {
+            if !reads_only_scalars(&lower["print".len()..], &scalars) {
+                return None;
+            }
+        } else {
+            // echo: only `$name` / `$&name` substitutions can read vectors
+            let reads_vector = words[1..].iter().any(|w| {
+                w.starts_with('$')
+                    && !reads_only_scalars(w.trim_start_matches(['$', '&']), &scalars)
+            });
+            if reads_vector {
+                return None;
+            }
+        }
+    }
+    if freqs.is_empty() {
+        return None;
+    }
+
+    let tokens: Vec<&str> = lines[ac_idx].split_whitespace().collect();
+    if tokens.len() != 5 {
+        return None;
+    }
+    let points: usize = tokens[2].parse().ok()?;
+    let (fstart, fstop) = (
+        parse_spice_number(tokens[3])?,
+        parse_spice_number(tokens[4])?,
+    );
+    if points == 0 || !(fstart > 0.0 && fstop > fstart) {
+        return None;
+    }
+
+    // Logarithmic sweeps place points at fstart * base^(k / points), linear ones
+    // at fstart + k * step
+    let log_base: Option<f64> = match tokens[1].to_ascii_lowercase().as_str() {
+        "dec" => Some(10.0),
+        "oct" => Some(2.0),
+        "lin" if points >= 2 => None,
+        _ => return None,
+    };
+    let step = (fstop - fstart) / (points.max(2) - 1) as f64;
+    let index = |f: f64| match log_base {
+        Some(base) => (f / fstart).log(base) * points as f64,
+        None => (f - fstart) / step,
+    };
+    let grid = |k: f64| match log_base {
+        Some(base) => fstart * base.powf(k / points as f64),
+        None => fstart + k * step,
+    };
+
+    let lo = freqs.iter().copied().fold(f64::INFINITY, f64::min) / SWEEP_MARGIN;
+    let hi = freqs.iter().copied().fold(f64::NEG_INFINITY, f64::max) * SWEEP_MARGIN;
+    // Tolerance for rounding in `index`, so points on the grid (fstop included,
+    // e.g. log10(1e9) * 10 = 89.99999999999999) land on their own index
+    const EPS: f64 = 1e-9;
+    let last = match log_base {
+        Some(_) => (index(fstop) + EPS).floor(),
+        None => (points - 1) as f64,
+    };
+    let k0 = (index(lo) + EPS).floor().max(0.0);
+    let k1 = (index(hi) - EPS).ceil().min(last);
+    if k0 >= k1 || (k0 <= 0.0 && k1 >= last) {
+        return None;
+    }
+
+    // Keep the original end points exactly where the narrowed sweep reaches them
+    let start = if k0 <= 0.0 { fstart } else { grid(k0) };
+    let stop = if k1 >= last { fstop } else { grid(k1) };
+    // Measured frequencies outside the sweep: leave it for ngspice to report
+    if freqs.iter().any(|&f| f < start || f > stop) {
+        return None;
+    }
+
+    let count = match log_base {
+        Some(_) => points,
+        None => (k1 - k0) as usize + 1,
+    };
+    let sweep = format!(".ac {} {} {:e} {:e}", tokens[1], count, start, stop);
+
+    let mut narrowed: Vec<String> = lines.iter().map(|line| line.to_string()).collect();
+    narrowed[ac_idx] = sweep;
+    let mut code = narrowed.join("\n");
+    if spice_code.ends_with('\n') {
+        code.push('\n');
+    }
+    Some(code)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn parses_scale_suffixes() {
+        assert_eq!(parse_spice_number("10k"), Some(10e3));
+        assert_eq!(parse_spice_number("2MEG"), Some(2e6));
+        assert_eq!(parse_spice_number("1e6"), Some(1e6));
+        assert_eq!(parse_spice_number("1G"), Some(1e9));
+        assert_eq!(parse_spice_number("abc"), None);
+    }
+
+    #[test]
+    fn narrows_decade_sweep_onto_grid() {
+        let code = ".ac dec 100 1 1G\nmeas ac gain FIND vdb(vout) AT=10\n\
+                    meas ac phase FIND vp(vout) AT=1e6\nlet pm = 180 + phase * 180 / pi\nprint pm gain";
+        let narrowed = narrow_ac_sweep(code).unwrap();
+        let sweep = narrowed.lines().next().unwrap();
+        let tokens: Vec<&str> = sweep.split_whitespace().collect();
+        assert_eq!(&tokens[..3], &[".ac", "dec", "100"]);
+
+        // Bounds lie on the original 100-per-decade grid around [10/3, 3e6]
+        let (start, stop) = (
+            parse_spice_number(tokens[3]).unwrap(),
+            parse_spice_number(tokens[4]).unwrap(),
+        );
+        assert!(start <= 10.0 / SWEEP_MARGIN && start > 3.0);
+        assert!(stop >= 1e6 * SWEEP_MARGIN && stop < 3.1e6);
+        for f in [start, stop] {
+            let k = f.log10() * 100.0;
+            assert!((k - k.round()).abs() < 1e-6);
+        }
+        assert_eq!(
+            narrowed.lines().skip(1).collect::<Vec<_>>(),
+            code.lines().skip(1).collect::<Vec<_>>()
+        );
+    }
+
+    #[test]
+    fn narrows_linear_sweep_onto_grid() {
+        let code = ".ac lin 1001 1k 1001k\nmeas ac gain FIND vdb(vout) AT=300k";
+        let narrowed = narrow_ac_sweep(code).unwrap();
+        assert_eq!(narrowed.lines().next(), Some(".ac lin 801 1e5 9e5"));
+    }
+
+    #[test]
+    fn keeps_top_grid_point_for_measurements_at_fstop() {
+        let code =
+            ".ac dec 100 1 1G\nmeas ac lo FIND vdb(vout) AT=1k\nmeas ac hi FIND vdb(vout) AT=1G";
+        let narrowed = narrow_ac_sweep(code).unwrap();
+        let tokens: Vec<&str> = narrowed
+            .lines()
+            .next()
+            .unwrap()
+            .split_whitespace()
+            .collect();
+        assert_eq!(parse_spice_number(tokens[4]), Some(1e9));
+        assert!(parse_spice_number(tokens[3]).unwrap() <= 1e3 / SWEEP_MARGIN);
+    }
+
+    #[test]
+    fn keeps_top_grid_point_for_measurements_in_last_interval() {
+        let code =
+            ".ac dec 10 1 1k\nmeas ac lo FIND vdb(vout) AT=10\nmeas ac hi FIND vdb(vout) AT=900";
+        let narrowed = narrow_ac_sweep(code).unwrap();
+        let tokens: Vec<&str> = narrowed
+            .lines()
+            .next()
+            .unwrap()
+            .split_whitespace()
+            .collect();
+        assert_eq!(parse_spice_number(tokens[4]), Some(1e3));
+        let code = ".ac lin 11 0.1k 1.1k\nmeas ac hi FIND vdb(vout) AT=1.05k";
+        let narrowed = narrow_ac_sweep(code).unwrap();
+        let tokens: Vec<&str> = narrowed
+            .lines()
+            .next()
+            .unwrap()
+            .split_whitespace()
+            .collect();
+        assert_eq!(parse_spice_number(tokens[4]), Some(1.1e3));
+    }
+
+    #[test]
+    fn keeps_sweep_for_range_measurements() {
+        let code = ".ac dec 100 1 1G\nmeas ac ugf WHEN vdb(vout)=0";
+        assert_eq!(narrow_ac_sweep(code), None);
+        let code = ".ac dec 100 1 1G\nmeas ac peak MAX vdb(vout) FROM=1k TO=1meg";
+        assert_eq!(narrow_ac_sweep(code), None);
+    }
+
+    #[test]
+    fn keeps_sweep_when_a_let_reads_a_vector() {
+        let code = ".ac dec 100 1 1G\nmeas ac phase_rad FIND vp(vout) AT=1e6\n\
+                    let dc_gain_val = vdb(vout)[0]";
+        assert_eq!(narrow_ac_sweep(code), None);
+        let code = ".ac dec 100 1 1G\nmeas ac gain FIND vdb(vout) AT=10\nprint frequency";
+        assert_eq!(narrow_ac_sweep(code), None);
+        let code = ".ac dec 100 1 1G\nmeas ac gain FIND vdb(vout) AT=10\nlet g = mag(v(out))";
+        assert_eq!(narrow_ac_sweep(code), None);
+    }
+
+    #[test]
+    fn keeps_sweep_when_measurements_fall_outside_it() {
+        let code = ".ac dec 100 1 1k\nmeas ac gain FIND vdb(vout) AT=1meg";
+        assert_eq!(narrow_ac_sweep(code), None);
+    }
+}
@@ -259,28 +259,32 @@ if __name__ == "__main__":
     print(f"Final Cost: {result.cost:.6e}")
     print(f"Iterations: {result.iterations}")
     print(f"Message: {result.message}")
+    print(f"Pareto Front: {len(result.pareto_front)} designs")
 
     print("\n" + "-" * 80)
     print("OPTIMIZED PARAMETERS")
     print("-" * 80)
 
+    groups = result.parameters_by_group
+
     print("\nDifferential Pair (M1, M2):")
-    for p in result.parameters[:4]:
+    for p in groups["XM1"] + groups["XM2"]:
         print(f"  {p.name:12s} = {p.value:8.4f}")
 
     print("\nActive Load (M3, M4):")
-    for p in result.parameters[4:8]:
+    for p in groups["XM3"] + groups["XM4"]:
         print(f"  {p.name:12s} = {p.value:8.4f}")
 
     print("\nTail Current Source (M5):")
-    for p in result.parameters[8:10]:
+    for p in groups["XM5"]:
         print(f"  {p.name:12s} = {p.value:8.4f}")
 
     print("\nOutput Stage (M6, M7):")
-    for p in result.parameters[10:14]:
+    for p in groups["XM6"] + groups["XM7"]:
         print(f"  {p.name:12s} = {p.value:8.4f}")
 
     print("\nCompensation Capacitor:")
-    print(f"  {result.parameters[14].name:12s} = {result.parameters[14].value:8.4f} pF")
+    for p in groups["C1"]:
+        print(f"  {p.name:12s} = {p.value:8.4f} pF")
 
     print("\n" + "=" * 80)
@@ -8,6 +8,7 @@ from uwasic_optimizer import (
     Environment,
     ParameterConstraint,
     RelationshipType,
+    OptimizationResult,
 )
 
 
@@ -54,9 +55,49 @@ def test_spice_test_creation():
     assert test.name == "AC_Analysis"
     assert test.spice_code == ".ac dec 100 0.1 1G"
     assert test.description == "AC analysis test"
+    assert test.high_fidelity is False
+    test.high_fidelity = True
+    assert test.high_fidelity is True
     print("✓ SpiceTest creation successful")
 
 
+def test_value_equality():
+    """Test tuple-based equality of the data classes (mutable, so unhashable)"""
+    param = Parameter(name="M1:W", value=16.0, min_val=2.0, max_val=50.0)
+    same = Parameter(name="M1:W", value=16.0, min_val=2.0, max_val=50.0)
+    other = Parameter(name="M1:W", value=8.0, min_val=2.0, max_val=50.0)
+    assert param == same
+    assert param != other
+    with pytest.raises(TypeError):
+        hash(param)
+
+    target = Target(metric="GBW", value=5e6, weight=1.0, mode=TargetMode.Min, unit="Hz")
+    same = Target(metric="GBW", value=5e6, weight=1.0, mode=TargetMode.Min, unit="Hz")
+    assert target == same
+    assert target != Target(metric="GBW", value=5e6, weight=2.0, mode=TargetMode.Min, unit="Hz")
+
+    env = Environment(name="VDD", value="1.8V")
+    assert env == Environment(name="VDD", value="1.8V")
+    assert Test("AC", [env], ".ac dec 10 1 1G", "") == Test(
+        "AC", [Environment(name="VDD", value="1.8V")], ".ac dec 10 1 1G", ""
+    )
+    print("✓ Value equality successful")
+
+
+def test_result_parameter_groups():
+    """Test OptimizationResult grouping of parameters by component"""
+    params = [
+        Parameter(name="XM1_W", value=5.0, min_val=0.42, max_val=50.0),
+        Parameter(name="XM1_L", value=1.0, min_val=0.15, max_val=10.0),
+        Parameter(name="C1_value", value=3.0, min_val=0.5, max_val=20.0),
+    ]
+    result = OptimizationResult(True, params, 0.0, 1, "Converged")
+    groups = result.parameters_by_group
+    assert sorted(groups) == ["C1", "XM1"]
+    assert [p.name for p in groups["XM1"]] == ["XM1_W", "XM1_L"]
+    print("✓ Result parameter groups successful")
+
+
 def test_optimizer_creation():
     """Test Optimizer object creation"""
     optimizer = Optimizer(
@@ -76,6 +117,31 @@ def test_optimizer_creation():
     print("✓ Optimizer creation successful")
 
 
+def test_optimizer_workers():
+    """Test Optimizer parallel worker option"""
+    optimizer = Optimizer(circuit="OpAmp_tb.sch", template="test/template", n_workers=4)
+    assert optimizer.n_workers == 4
+    assert Optimizer().n_workers == 1
+    print("✓ Optimizer worker option successful")
+
+
+def test_optimizer_unknown_solver():
+    """Test Optimizer rejects unregistered solver names"""
+    with pytest.raises(ValueError):
+        Optimizer(circuit="OpAmp_tb.sch", template="test/template", solver="simplex")
+    assert Optimizer(solver="cmaes").solver == "cmaes"
+    assert Optimizer(solver="mopso").solver == "mopso"
+    print("✓ Optimizer solver validation successful")
+
+
+def test_optimizer_seed():
+    """Test Optimizer random seed option"""
+    optimizer = Optimizer(circuit="OpAmp_tb.sch", template="test/template", seed=42)
+    assert optimizer.seed == 42
+    assert Optimizer().seed is None
+    print("✓ Optimizer seed option successful")
+
+
 def test_optimize_call():
     """Test calling optimize method"""
     print("\nTesting optimize() call...")